@@ -4,11 +4,34 @@ from .substance import Substance
 from .element   import Element
 from .molecule  import Molecule
 from .mixture   import Mixture
+from .registry  import IsotopeRegistry, isotope_registry
 
 from .isotopes import *
 from .elements import *
 
+from .nuclides  import NuclideTable, nuclide_table
+from .expansion import NaturalExpansion, natural_expansion
+from .formula   import parse_formula, molecule_from_formula, molecules_from_formulas
+from .streaming import CompiledMixture, stream_compositions
+from .library   import MaterialLibrary, substitute
+from .densities import number_densities, number_densities_many
+from .writers   import write_mcnp, write_serpent, write_openmc
+from .readers   import read_mcnp, read_mcnp_vectors
+from .tables    import IsotopeTable
+from .sparse    import MaterialMatrix
+from .store     import VectorStore, write_store, write_store_vectors
+from .serialization import to_json, from_json, to_binary, from_binary
+from .definitions import MaterialDefinitions
+
 from .conversion import *
 
 
+def __getattr__(name: str):
+    # server (socketserver, threading) is only imported when used
+    if name in {"EvaluationServer", "serve", "query"}:
+        from . import server
+        return getattr(server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # DEBUG
@@ -0,0 +1,8 @@
+"""Entry point of the command-line batch evaluator (see "cli.py")."""
+
+import sys
+
+from .cli import main
+
+
+sys.exit(main())
@@ -0,0 +1,160 @@
+"""Functions for the command-line batch evaluator.
+
+Evaluates materials of a library file (see `MaterialDefinitions`) to isotopic
+or elemental compositions and writes them as CSV, JSON lines or vector store
+(see `VectorStore`). Materials are evaluated in parallel worker processes with
+`--jobs`, each loading the library once. Usage:
+
+    python -m isovec library.toml [names ...] [--elements] [--mode weight]
+        [--natural] [--format csv|jsonl|store] [--output path] [--jobs N]
+    python -m isovec library.toml --serve socket
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+import json
+import sys
+import time
+
+from .definitions import MaterialDefinitions
+from .store import write_store_vectors
+
+
+_definitions: MaterialDefinitions | None = None  # library of the current (worker) process
+_options: tuple[bool, bool, bool] = (False, False, False)  # by_weight, use_natural, elements
+
+
+def _init_worker(path: str, options: tuple[bool, bool, bool]) -> None:
+    """Loads the library once per worker process."""
+    global _definitions, _options
+    _definitions = MaterialDefinitions.from_file(path)
+    _options = options
+
+def _evaluate(names: Sequence[str]) -> list[tuple[str, list, list[float]]]:
+    """Returns keys (ZAI notations or names of elements) and fractions of materials."""
+
+    by_weight, use_natural, elements = _options
+    mode = "weight" if by_weight else "atomic"
+    results = []
+    for name in names:
+        substance = _definitions.get(name)
+        if elements:
+            composition = substance.get_elements(mode)
+            keys = [element.name for element in composition]
+        else:
+            composition = dict(sorted(substance.get_isotopes(mode, use_natural).items(), key=lambda item: item[0].ZAI))
+            keys = [isotope.ZAI for isotope in composition]
+        results.append((name, keys, list(composition.values())))
+    return results
+
+def _chunks(names: Sequence[str], size: int) -> Iterator[Sequence[str]]:
+    for i in range(0, len(names), size):
+        yield names[i:i + size]
+
+
+def main(argv: Sequence[str] = None) -> int:
+    """Runs the batch evaluator.
+
+    Args:
+        argv:
+            Command-line arguments (without program name). Defaults to
+            `sys.argv`.
+
+    Returns:
+        Exit code (1 if the library could not be loaded or a material could
+        not be evaluated).
+    """
+
+    parser = argparse.ArgumentParser(prog="isovec", description="Evaluate materials of a library file to isotopic or elemental compositions.")
+    parser.add_argument("library", help="material library file (.toml or .json)")
+    parser.add_argument("names", nargs="*", help="materials to evaluate (default: all)")
+    parser.add_argument("--elements", action="store_true", help="evaluate elements instead of isotopes")
+    parser.add_argument("--mode", choices=("atomic", "weight"), default="atomic", help="fractions to evaluate (default: atomic)")
+    parser.add_argument("--natural", action="store_true", help="use natural elements instead of their isotopes")
+    parser.add_argument("--format", choices=("csv", "jsonl", "store"), default="csv", help="output format (default: csv)")
+    parser.add_argument("--output", "-o", help="output file (default: standard output, required for store)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="number of worker processes (default: 1)")
+    parser.add_argument("--chunksize", type=int, default=64, help="materials per task of a worker (default: 64)")
+    parser.add_argument("--serve", metavar="SOCKET", help="serve the library on a Unix domain socket instead (see `EvaluationServer`)")
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        from .server import serve  # only needed for serving
+        try:
+            serve(args.serve, args.library)
+        except (OSError, ImportError, KeyError, ValueError) as ex:
+            print(f"isovec: error: {ex}", file=sys.stderr)
+            return 1
+        return 0
+
+    if args.format == "store" and (args.elements or not args.output):
+        parser.error("format store requires isotopes and --output")
+    if args.jobs < 1 or args.chunksize < 1:
+        parser.error("--jobs and --chunksize must be positive")
+
+    options = (args.mode == "weight", args.natural, args.elements)
+
+    t_start = time.perf_counter()
+    try:
+        _init_worker(args.library, options)
+    except (OSError, ImportError, ValueError) as ex:  # missing file, TOML parser or invalid document
+        print(f"isovec: error: {ex}", file=sys.stderr)
+        return 1
+    names = args.names or list(_definitions)
+    unknown = [name for name in names if name not in _definitions]
+    if unknown:
+        parser.error(f"unknown materials: {', '.join(unknown)}")
+    t_loaded = time.perf_counter()
+
+    if args.jobs == 1:
+        results = (result for chunk in _chunks(names, args.chunksize) for result in _evaluate(chunk))
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(args.jobs, initializer=_init_worker, initargs=(args.library, options))
+        results = (result for chunk in executor.map(_evaluate, _chunks(names, args.chunksize)) for result in chunk)
+
+    try:
+        if args.format == "store":
+            count = write_store_vectors(args.output, results, by_weight=options[0])
+        else:
+            file = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+            try:
+                count = _write_text(file, results, args.format, "element" if args.elements else "ZAI")
+            finally:
+                if file is not sys.stdout:
+                    file.close()
+    except (KeyError, ValueError) as ex:
+        print(f"isovec: error: {ex}", file=sys.stderr)
+        return 1
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    t_done = time.perf_counter()
+
+    rate = count / (t_done - t_loaded) if t_done > t_loaded else 0.0
+    print(
+        f"isovec: {count} materials, load {t_loaded - t_start:.3f} s, "
+        f"evaluate and write {t_done - t_loaded:.3f} s ({rate:.0f} materials/s, {args.jobs} jobs)",
+        file=sys.stderr
+    )
+    return 0
+
+def _write_text(file, results, output_format: str, key_name: str) -> int:
+    """Writes results as CSV or JSON lines and returns number of materials."""
+
+    count = 0
+    if output_format == "csv":
+        writer = csv.writer(file, lineterminator="\n")
+        writer.writerow(("material", key_name, "fraction"))
+        for name, keys, fractions in results:
+            writer.writerows(zip([name]*len(keys), keys, fractions))
+            count += 1
+    else:
+        for name, keys, fractions in results:
+            file.write(json.dumps({"material": name, key_name: keys, "fraction": fractions}) + "\n")
+            count += 1
+    return count
@@ -8,6 +8,9 @@ Mappings of atomic number to element symbol and element symbol to element name.
 N_A = 6.02214076E+23
 """Avogadro constant [mol^-1]."""
 
+BARN = 1E-24
+"""Barn [cm^2]."""
+
 M_u = 0.99999999965E-03  # ...(30)
 """Molar mass constant [kg mol^-1] (after 2019 redefinition)."""
 
@@ -0,0 +1,226 @@
+"""Class for MaterialDefinitions.
+
+The MaterialDefinitions class holds declarative material definitions, e.g. of a
+TOML or JSON file, and builds the substances lazily: an entry and the entries
+it references are constructed only when it is requested for the first time.
+
+Each entry maps a name to a composition, e.g. in TOML:
+
+    steel316 = {Fe_nat = -0.65, Cr_nat = -0.17, Ni_nat = -0.12, Mo_nat = -0.025, Mn_nat = -0.02, Si_nat = -0.015}
+
+    [steel316-hot]
+    rho = 7.8
+    composition = {steel316 = 1}
+
+    [water]
+    type = "Molecule"
+    formula = "H2O"
+    rho = 0.998
+
+    [coolant]
+    mode = "volume"
+    composition = {water = 0.9, steel316-hot = 0.1}
+
+Simple entries only contain the composition, with positive values for atomic
+and negative values for weight fractions (like the default constructor mode).
+Extended entries contain the composition in "composition" (or a chemical
+formula in "formula") and optionally "type" ("Element", "Molecule" or
+"Mixture"), "mode", "rho", "M" and "symbol". Constituents are resolved as other
+entries, variables of the library (e.g. "Fe_nat", "U_235") or isotope
+notations (e.g. "U-235"). Without type, entries made of isotopes are elements,
+all others mixtures.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import json
+import os
+from typing import Any
+
+from . import isotopes as _isotopes
+from . import elements as _elements
+from .isotope import Isotope
+from .substance import Substance
+from .element import Element
+from .molecule import Molecule
+from .mixture import Mixture
+from .registry import isotope_registry
+from .formula import molecule_from_formula
+
+
+_TYPES = {"Element": Element, "Molecule": Molecule, "Mixture": Mixture}
+
+_RESERVED = {"type", "mode", "rho", "M", "symbol", "composition", "formula"}
+"""Keys of extended entries."""
+
+_LIBRARY: dict[str, Isotope | Substance] = {
+    name: obj
+    for module in (_isotopes, _elements)
+    for name, obj in vars(module).items()
+    if not name.startswith("_") and isinstance(obj, (Isotope, Substance))
+}
+"""Variables of the library by their name."""
+
+
+class MaterialDefinitions:
+    """Collection of declarative material definitions with lazy construction.
+
+    Entries are built on first access (`get()` or indexing) together with all
+    entries they reference. Built substances are cached, so that shared entries
+    are the same objects.
+    """
+
+    def __init__(self, definitions: dict[str, dict[str, Any]]) -> None:
+        """Constructor of material definitions.
+
+        Args:
+            definitions:
+                Dictionary that maps names to entries (see module description).
+        """
+
+        self._definitions = definitions
+        self._built: dict[str, Substance] = {}
+        self._building: set[str] = set()  # entries under construction (detection of cycles)
+
+    @classmethod
+    def from_toml(cls, text: str) -> MaterialDefinitions:
+        """Returns material definitions of a TOML document.
+
+        Raises:
+            ImportError: If neither tomllib (Python 3.11+) nor tomli is
+            available.
+        """
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError as ex:
+                raise ImportError("tomllib (Python 3.11+) or tomli is required for TOML files.") from ex
+        return cls(tomllib.loads(text))
+
+    @classmethod
+    def from_json(cls, text: str) -> MaterialDefinitions:
+        """Returns material definitions of a JSON document."""
+        return cls(json.loads(text))
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike) -> MaterialDefinitions:
+        """Returns material definitions of a TOML (".toml") or JSON file.
+
+        Raises:
+            ImportError: If a TOML file is read without a TOML parser.
+        """
+        with open(path, "r", encoding="utf-8") as file:
+            text = file.read()
+        if os.fspath(path).lower().endswith(".toml"):
+            return cls.from_toml(text)
+        return cls.from_json(text)
+
+
+    # ########
+    # Construction
+    # ########
+
+    def get(self, name: str) -> Substance:
+        """Returns the substance of an entry, that is built on first access.
+
+        Raises:
+            KeyError: If there is no entry with this name or a constituent
+            could not be resolved.
+            ValueError: If the entry could not be interpreted or references
+            itself.
+        """
+
+        try:
+            return self._built[name]
+        except KeyError:
+            pass
+        try:
+            entry = self._definitions[name]
+        except KeyError:
+            raise KeyError(f"No material definition \"{name}\".") from None
+        if name in self._building:
+            raise ValueError(f"Material definition \"{name}\" references itself.")
+
+        self._building.add(name)
+        try:
+            substance = self._build(name, entry)
+        finally:
+            self._building.discard(name)
+        self._built[name] = substance
+        return substance
+
+    def get_many(self, names: Iterable[str]) -> list[Substance]:
+        """Returns the substances of a collection of entries (see `get()`)."""
+        return [self.get(name) for name in names]
+
+    def _build(self, name: str, entry: dict[str, Any]) -> Substance:
+        """Builds the substance of an entry."""
+
+        if not isinstance(entry, dict):
+            raise ValueError(f"Material definition \"{name}\" must be a table.")
+
+        if _RESERVED.isdisjoint(entry):  # simple entry
+            entry = {"composition": entry}
+        elif not {"composition", "formula"} & entry.keys():
+            raise ValueError(f"Material definition \"{name}\" requires a composition or formula.")
+
+        kwargs = {key: entry[key] for key in ("rho", "M", "symbol") if key in entry}
+
+        if "formula" in entry:
+            molecule = molecule_from_formula(entry["formula"])  # exact number of atoms
+            composition = dict(zip(molecule.constituents, molecule.fractions))
+            kwargs.setdefault("symbol", entry["formula"])
+            cls = self._type(name, entry, Molecule)
+            if cls is Molecule:
+                return Molecule.from_trusted(name, composition, atoms=molecule.atoms, **kwargs)
+            return cls(name, composition, mode="atomic", **kwargs)
+
+        composition = {self._resolve(key, name): fraction for key, fraction in entry["composition"].items()}
+        if all(isinstance(constituent, Isotope) for constituent in composition):
+            cls = self._type(name, entry, Element)
+        else:
+            cls = self._type(name, entry, Mixture)
+        return cls(name, composition, mode=entry.get("mode", "_legacy"), **kwargs)
+
+    def _type(self, name: str, entry: dict[str, Any], default: type[Substance]) -> type[Substance]:
+        """Returns the class of an entry, given by its type or the default."""
+        if "type" not in entry:
+            return default
+        try:
+            return _TYPES[entry["type"]]
+        except (KeyError, TypeError):
+            raise ValueError(f"Unknown type \"{entry['type']}\" of material definition \"{name}\".") from None
+
+    def _resolve(self, key: str, name: str) -> Isotope | Substance:
+        """Returns the constituent of a key: other entry, library variable or isotope notation."""
+
+        if key in self._definitions:
+            return self.get(key)
+        try:
+            return _LIBRARY[key]
+        except KeyError:
+            pass
+        try:
+            return isotope_registry.parse(key)
+        except (ValueError, KeyError):
+            raise KeyError(f"Could not resolve constituent \"{key}\" of material definition \"{name}\".") from None
+
+
+    # ########
+    # Operators
+    # ########
+
+    def __getitem__(self, name: str) -> Substance:
+        return self.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._definitions
+
+    def __len__(self) -> int:
+        return len(self._definitions)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._definitions)
@@ -0,0 +1,99 @@
+r"""Functions for number densities of isotopes.
+
+Transport codes expect the composition of a material as number density of each
+isotope in atoms per barn-centimetre:
+    $$N_i = \frac{\rho \cdot N_{\mathrm{A}} \cdot w_i}{M_i} \cdot 10^{-24}$$
+The coefficients $N_{\mathrm{A}} \cdot w_i / M_i \cdot 10^{-24}$ only depend on
+the composition and are cached by the substance, so that number densities for
+(many) densities are obtained by a single scaling of an array.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Sequence
+
+from .substance import Substance
+
+
+def number_densities(
+        substance: Substance, rho: float = None, use_natural: bool | Iterable = False
+    ) -> tuple[array, array]:
+    """Returns isotopes and their number densities of a substance.
+
+    Args:
+        substance:
+            Substance to evaluate.
+        rho:
+            Density [g cm^-3]. Defaults to the density of the substance.
+        use_natural:
+            Flag to use fraction of element, if it is natural.
+            Alternatively, a collection of elements can be supplied, that
+            shall be considered.
+
+    Returns:
+        Tuple of arrays with ZAI notations and number densities
+        [barn^-1 cm^-1], in ascending order of the ZAI notation.
+
+    Raises:
+        ValueError: If substance has no density.
+    """
+
+    if rho is None:
+        rho = substance.rho
+    if not rho:
+        raise ValueError(f"Number densities of {substance.__class__.__name__} \"{substance.name}\" require a density.")
+
+    rho = float(rho)
+    zai, coefficients = substance._number_density_coefficients(Substance._natural_keys(use_natural))
+    return zai, array("d", (rho*c for c in coefficients))
+
+def number_densities_many(
+        substances: Sequence[Substance], densities: Sequence[float] = None,
+        use_natural: bool | Iterable = False
+    ) -> tuple[array, array, array]:
+    """Returns isotopes and their number densities of a collection of substances.
+
+    The results of all substances are concatenated, with offsets given by an
+    index pointer array (like a sparse matrix in CSR format): the values of
+    substance k are found in `[indptr[k]:indptr[k+1]]`.
+
+    Args:
+        substances:
+            Substances to evaluate.
+        densities:
+            Density [g cm^-3] of each substance. Defaults to the densities of
+            the substances.
+        use_natural:
+            Flag to use fraction of element, if it is natural.
+            Alternatively, a collection of elements can be supplied, that
+            shall be considered.
+
+    Returns:
+        Tuple of arrays with index pointer, ZAI notations and number densities
+        [barn^-1 cm^-1].
+
+    Raises:
+        ValueError: If number of densities does not match the substances or a
+        substance has no density.
+    """
+
+    if densities is None:
+        densities = [substance.rho for substance in substances]
+    elif len(densities) != len(substances):
+        raise ValueError(f"Number of densities ({len(densities)}) must match the number of substances ({len(substances)}).")
+
+    natural_keys = Substance._natural_keys(use_natural)
+    indptr = array("q", [0])
+    zai = array("q")
+    values = array("d")
+    for substance, rho in zip(substances, densities):
+        if not rho:
+            raise ValueError(f"Number densities of {substance.__class__.__name__} \"{substance.name}\" require a density.")
+        rho = float(rho)
+        zai_k, coefficients = substance._number_density_coefficients(natural_keys)
+        zai.extend(zai_k)
+        values.extend(rho*c for c in coefficients)
+        indptr.append(len(zai))
+
+    return indptr, zai, values
@@ -3,6 +3,8 @@
 Element class serves as constituents for `Molecule`.
 """
 
+from __future__ import annotations
+
 from .substance import Substance
 from .isotope import Isotope
 from .isotopes import _natural_compositions
@@ -26,6 +28,8 @@ class Element(Substance):
     
     _RIGHT_ALIGN_PREF = -2  # override
 
+    __slots__ = ("_is_natural", "_Z")
+
     def __init__(self, name: str, composition: dict[Isotope, float], mode: str = "_legacy", natural: bool = False, **kwargs) -> None:
         """Constructor of element.
         
@@ -58,18 +62,29 @@ class Element(Substance):
             not an isotope.
         """
 
-        super().__init__(name=name, composition=composition, mode=mode, **kwargs)
+        super().__init__(name=name, composition=composition, mode=mode, natural=natural, **kwargs)
+
+        # make sure all isotopes are of the same element
+        self._check_atomic_numbers()
+
+    # override
+    def _setup(self, name: str, composition: dict[Isotope, float], natural: bool = False, **kwargs) -> None:
+
+        super()._setup(name, composition, **kwargs)
 
         self._is_natural = natural
 
-        # take atomic number of first isotope (and make sure all isotopes are of the same element)
+        # take atomic number of first isotope
         self._Z: int = next(iter(composition)).Z  # atomic number of element
-        if not all(self._Z == isotope.Z for isotope in composition.keys()):
-            raise ValueError(f"Atomic number of all isotopes of {self.__class__.__name__} \"{self._name}\" must match!")
         
         # construct symbol
         if not self._symbol:
             self._symbol = self.element_symbol()
+
+    def _check_atomic_numbers(self) -> None:
+        """Raises ValueError, if atomic numbers of the isotopes do not match."""
+        if not all(self._Z == isotope.Z for isotope in self._constituents):
+            raise ValueError(f"Atomic number of all isotopes of {self.__class__.__name__} \"{self._name}\" must match!")
         
 
     # override
@@ -87,6 +102,11 @@ class Element(Substance):
         """Atomic number of the element."""
         return self._Z
     
+    @property
+    def is_natural(self):
+        """Flag for natural element."""
+        return self._is_natural
+
     @property
     def A_r(self):
         """Relative atomic mass (atomic weight) [-] of the element."""
@@ -104,7 +124,7 @@ class Element(Substance):
         fraction and summed up:
             $$\overline{M} = \sum_i \left( x_i \cdot A_\mathrm{r},i \right)$$
         """
-        return sum(x_i*isotope.A_r for isotope, x_i in self._composition.items())
+        return sum(x_i*isotope.A_r for isotope, x_i in zip(self._constituents, self._fractions))
 
 
     # ########
@@ -118,15 +138,37 @@ class Element(Substance):
         else:
             return None
 
+    # override
+    def _natural_key(self) -> tuple[int, float]:
+        return (self._Z, self.M)
+
     # override
     def _append_elements(self, element_list: dict, by_weight: bool = False, f_p: float = 1.0):
 
         element_list[-1] = element_list[-1] + 1  # increase counter
         element_list[element_list[-1]] = (self, f_p)  # append element
-        element_list[-1] = element_list[-1] + len(self._composition)  # skip numbers of isotopes in element
+        element_list[-1] = element_list[-1] + len(self._constituents)  # skip numbers of isotopes in element
 
         return element_list
 
+    # override
+    def _raw_elements(self, by_weight: bool = False) -> dict[Substance, float]:
+        return {self: 1.0}
+
+    # override
+    def _raw_isotopes(self, by_weight: bool = False, natural_keys: bool | frozenset = False) -> dict[Isotope, float]:
+
+        key = ("isotopes", by_weight, natural_keys)
+        try:
+            return self._cache[key]
+        except KeyError:
+            if self._is_natural and natural_keys and (natural_keys is True or self._natural_key() in natural_keys):
+                raw = {self.surrogate_isotope(): 1.0}
+            else:
+                raw = dict(zip(self._constituents, self._gathering_fractions(by_weight)))
+            self._cache[key] = raw
+            return raw
+
 
     # ########
     # Functions
@@ -136,6 +178,11 @@ class Element(Substance):
         """Returns the element symbol as a string."""
         return ATOM_NUMB_TO_SYMBOL[self._Z]
 
+    # override
+    def validate(self, recursive: bool = False) -> None:
+        super().validate(recursive)
+        self._check_atomic_numbers()
+
 
     # ########
     # Operators
@@ -143,11 +190,11 @@ class Element(Substance):
     
     def __hash__(self):
         #return hash((self.__class__, self._name))
-        return hash((self.__class__, self._Z, self._M))
+        return hash((self.__class__, self._Z, self.M))
 
     def __eq__(self, other):
         try:
-            if (self._Z == other._Z) and (self._M == other._M):
+            if (self._Z == other._Z) and (self.M == other.M):
                 return True
             else:
                 return False
@@ -162,7 +209,7 @@ class Element(Substance):
             if self._Z < other._Z:
                 return True
             elif self._Z == other._Z:
-                if self._M < other._M:
+                if self.M < other.M:
                     return True
                 else:
                     return False
@@ -179,7 +226,7 @@ class Element(Substance):
             if self._Z > other._Z:
                 return True
             elif self._Z == other._Z:
-                if self._M > other._M:
+                if self.M > other.M:
                     return True
                 else:
                     return False
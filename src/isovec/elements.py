@@ -741,3 +741,21 @@ U_nat = Element("natural uranium", {
 
 # 118: Og (oganesson)
 # not naturally occuring
+
+
+
+# ################
+# lookup and precomputation
+# ################
+
+_natural_elements = {
+    element.Z: element for element in list(globals().values())
+    if isinstance(element, Element) and element.is_natural
+}
+"""Mapping of atomic number to natural element."""
+
+# weight fractions are needed for every occurrence of an element, when
+# isotopes are gathered in weight mode, so they are converted once on import
+for _element in _natural_elements.values():
+    _element._fractions_in_wt()
+del _element
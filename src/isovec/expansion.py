@@ -0,0 +1,193 @@
+"""Class for NaturalExpansion.
+
+The NaturalExpansion class is a sparse matrix from natural elements to their
+isotopes, in atomic and weight fractions. It expands elemental compositions,
+e.g. as returned by `get_elements()`, to isotopic compositions without creating
+any substance. `natural_expansion` is the matrix of all natural elements of the
+library.
+
+As the package has no dependencies, `expand()` and `expand_many()` accumulate
+the rows of the CSR arrays in plain Python instead of computing one sparse
+matrix product. With SciPy, the product of an elemental matrix (columns ordered
+like `rows`) with `as_scipy()` expands many compositions at once.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any, Literal
+
+from .isotope import Isotope
+from .element import Element
+from .elements import _natural_elements
+
+
+class NaturalExpansion:
+    """Sparse matrix from natural elements to isotopes.
+
+    Rows are natural elements, ordered by their atomic number, columns are
+    isotopes, ordered by their ZAI notation. The matrix is stored in compressed
+    sparse row (CSR) format with shared index arrays and separate data arrays
+    for atomic and weight fractions.
+    """
+
+    def __init__(self, elements: Iterable[Element]) -> None:
+        """Constructor of natural expansion matrix.
+
+        Args:
+            elements:
+                Natural elements, that form the rows of the matrix.
+        """
+
+        elements = sorted(elements, key=lambda element: element.Z)
+
+        self._rows: tuple[int, ...] = tuple(element.Z for element in elements)  # atomic number of each row
+        self._row_of_Z: dict[int, int] = {Z: row for row, Z in enumerate(self._rows)}
+        self._columns: tuple[Isotope, ...] = tuple(sorted(
+            {isotope for element in elements for isotope in element.constituents}, key=lambda isotope: isotope.ZAI
+        ))
+        column_of = {isotope: column for column, isotope in enumerate(self._columns)}
+
+        self._indptr = array("q", [0])
+        self._indices = array("q")
+        self._data_at = array("d")
+        self._data_wt = array("d")
+        for element in elements:
+            for isotope, x_i, w_i in zip(element.constituents, element.fractions, element._fractions_in_wt()):
+                self._indices.append(column_of[isotope])
+                self._data_at.append(x_i)
+                self._data_wt.append(w_i)
+            self._indptr.append(len(self._indices))
+
+
+    # ########
+    # Properties
+    # ########
+
+    @property
+    def rows(self):
+        """Atomic numbers of the rows."""
+        return self._rows
+
+    @property
+    def columns(self):
+        """Isotopes of the columns."""
+        return self._columns
+
+    @property
+    def shape(self):
+        """Number of rows and columns."""
+        return (len(self._rows), len(self._columns))
+
+
+    # ########
+    # Matrix
+    # ########
+
+    def matrix(self, mode: Literal["atomic", "weight"] = "atomic") -> tuple[array, array, array]:
+        """Returns the matrix in CSR format.
+
+        Args:
+            mode:
+                Wether 'atomic' or 'weight' fractions are to be fetched.
+
+        Returns:
+            Tuple of index pointer, column indices and data arrays.
+        """
+        return self._indptr, self._indices, self._data(mode)
+
+    def as_scipy(self, mode: Literal["atomic", "weight"] = "atomic") -> Any:
+        """Returns the matrix as SciPy CSR matrix.
+
+        Raises:
+            ImportError: If SciPy is not installed.
+        """
+        try:
+            from scipy.sparse import csr_matrix
+        except ImportError as ex:
+            raise ImportError("SciPy is required for sparse matrices.") from ex
+        indptr, indices, data = self.matrix(mode)
+        return csr_matrix((data, indices, indptr), shape=self.shape)
+
+    def _data(self, mode: str) -> array:
+        """Returns data array for given mode."""
+        if mode in {"atomic", "at", "mole", "mol"}:
+            return self._data_at
+        elif mode in {"weight", "wt"}:
+            return self._data_wt
+        else:
+            raise ValueError(f"Mode \"{mode}\" not supported for expanding elements.")
+
+
+    # ########
+    # Expansion
+    # ########
+
+    def expand(
+            self, elemental_vector: dict[Element | int, float],
+            mode: Literal["atomic", "weight"] = "atomic"
+        ) -> dict[Isotope, float]:
+        """Expands an elemental composition to its isotopic composition.
+
+        Natural elements and atomic numbers are expanded with the matrix,
+        other elements with their own composition. Fractions must be given in
+        the same mode as the fractions to be fetched.
+
+        Args:
+            elemental_vector:
+                Dictionary that maps elements or atomic numbers to their
+                fraction.
+            mode:
+                Wether 'atomic' or 'weight' fractions are to be fetched.
+
+        Returns:
+            Dictionary that maps occuring isotopes to their fraction.
+
+        Raises:
+            KeyError: If an atomic number has no natural element.
+        """
+
+        data = self._data(mode)
+        by_weight = data is self._data_wt
+        indptr, indices = self._indptr, self._indices
+
+        summed = defaultdict(float)  # {column: fraction}
+        custom = defaultdict(float)  # {isotope: fraction} of non-natural elements
+        for key, fraction in elemental_vector.items():
+            if isinstance(key, Element) and not key.is_natural:
+                fractions = key._fractions_in_wt() if by_weight else key.fractions
+                for isotope, f_i in zip(key.constituents, fractions):
+                    custom[isotope] += fraction*f_i
+                continue
+
+            Z = key.Z if isinstance(key, Element) else key
+            try:
+                row = self._row_of_Z[Z]
+            except KeyError:
+                raise KeyError(f"No natural element with atomic number {Z}.") from None
+            for k in range(indptr[row], indptr[row + 1]):
+                summed[indices[k]] += fraction*data[k]
+
+        isotopes = {self._columns[column]: summed[column] for column in sorted(summed)}
+        if custom:
+            for isotope, fraction in custom.items():
+                isotopes[isotope] = isotopes.get(isotope, 0.0) + fraction
+            isotopes = dict(sorted(isotopes.items()))
+        return isotopes
+
+    def expand_many(
+            self, elemental_vectors: Iterable[dict[Element | int, float]],
+            mode: Literal["atomic", "weight"] = "atomic"
+        ) -> list[dict[Isotope, float]]:
+        """Expands a collection of elemental compositions (see `expand()`).
+
+        Each composition is expanded separately; for a single sparse matrix
+        product see the module description.
+        """
+        return [self.expand(elemental_vector, mode) for elemental_vector in elemental_vectors]
+
+
+natural_expansion = NaturalExpansion(_natural_elements.values())
+"""Expansion matrix of all natural elements of the library."""
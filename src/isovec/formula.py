@@ -0,0 +1,124 @@
+"""Functions for chemical formulas.
+
+Chemical formulas like "H2O", "Ca(OH)2" or "Al2(SO4)3·18H2O" are parsed to the
+number of atoms per element and converted to `Molecule`s made of the natural
+elements of the library. Molecules are cached by their formula.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import lru_cache
+import re
+
+from .constants import ATOM_NUMB_TO_SYMBOL
+from .molecule import Molecule
+from .elements import _natural_elements
+
+
+_SYMBOL_TO_ATOM_NUMB = {symbol: Z for Z, symbol in ATOM_NUMB_TO_SYMBOL.items()}
+
+_TOKEN = re.compile(r"[A-Z][a-z]?|\d+|[(\[]|[)\]]|\S")
+"""Pattern for tokens of a formula: element symbols, numbers and brackets."""
+
+_ADDUCT_SEP = re.compile(r"\s*[·•∙*.]\s*")
+"""Pattern for separators of adducts, e.g. water of crystallisation."""
+
+
+def parse_formula(formula: str) -> dict[int, int]:
+    """Returns number of atoms per atomic number of a chemical formula.
+
+    Groups in round or square brackets can be multiplied by a subscript.
+    Adducts, like water of crystallisation, are separated by "·", "*" or "."
+    and can have a leading coefficient, e.g. "CuSO4·5H2O".
+
+    Args:
+        formula:
+            Chemical formula.
+
+    Returns:
+        Dictionary that maps atomic numbers to their number of atoms, in order
+        of first appearance.
+
+    Raises:
+        ValueError: If formula could not be interpreted.
+    """
+
+    atoms: dict[int, int] = {}
+    for part in _ADDUCT_SEP.split(formula.strip()):
+        match = re.match(r"(\d*)(.*)", part)
+        coefficient = int(match.group(1)) if match.group(1) else 1
+        for Z, count in _parse_group(match.group(2), formula).items():
+            atoms[Z] = atoms.get(Z, 0) + coefficient*count
+
+    if not atoms:
+        raise ValueError(f"Could not interpret formula \"{formula}\".")
+    return atoms
+
+def _parse_group(part: str, formula: str) -> dict[int, int]:
+    """Returns number of atoms per atomic number of a formula without adducts."""
+
+    tokens = _TOKEN.findall(part)
+    stack: list[dict[int, int]] = [{}]  # one level per opened bracket
+
+    def subscript(i: int) -> tuple[int, int]:
+        """Returns subscript following token i (default one) and index of next token."""
+        if i + 1 < len(tokens) and tokens[i + 1].isdigit():
+            return int(tokens[i + 1]), i + 2
+        return 1, i + 1
+
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token in _SYMBOL_TO_ATOM_NUMB:
+            count, i = subscript(i)
+            Z = _SYMBOL_TO_ATOM_NUMB[token]
+            stack[-1][Z] = stack[-1].get(Z, 0) + count
+        elif token in "([":
+            stack.append({})
+            i += 1
+        elif token in ")]" and len(stack) > 1:
+            count, i = subscript(i)
+            group = stack.pop()
+            for Z, n in group.items():
+                stack[-1][Z] = stack[-1].get(Z, 0) + count*n
+        else:
+            raise ValueError(f"Could not interpret \"{token}\" in formula \"{formula}\".")
+
+    if len(stack) > 1:
+        raise ValueError(f"Unbalanced brackets in formula \"{formula}\".")
+    return stack[0]
+
+
+@lru_cache(maxsize=8192)
+def molecule_from_formula(formula: str) -> Molecule:
+    """Returns molecule of natural elements for a chemical formula.
+
+    The formula is used as name and symbol of the molecule. Results are cached
+    by the formula string, so equal formulas share the same molecule. Use
+    `copy()` on the returned molecule to set a density.
+
+    Args:
+        formula:
+            Chemical formula (see `parse_formula()`).
+
+    Raises:
+        ValueError: If formula could not be interpreted or contains an element
+        without natural composition.
+    """
+
+    counts = {}
+    for Z, count in parse_formula(formula).items():
+        try:
+            counts[_natural_elements[Z]] = count
+        except KeyError:
+            raise ValueError(f"Element \"{ATOM_NUMB_TO_SYMBOL[Z]}\" in formula \"{formula}\" does not occur naturally.") from None
+
+    # exact number of atoms, natural elements need no validation
+    atoms = sum(counts.values())
+    composition = {element: count/atoms for element, count in counts.items()}
+    return Molecule.from_trusted(formula, composition, atoms=atoms, symbol=formula)
+
+def molecules_from_formulas(formulas: Iterable[str]) -> list[Molecule]:
+    """Returns molecules for a collection of chemical formulas (see `molecule_from_formula()`)."""
+    return [molecule_from_formula(formula) for formula in formulas]
@@ -0,0 +1,374 @@
+"""Class for MaterialLibrary and functions for collections of substances.
+
+The MaterialLibrary class registers materials and keeps a reverse index from
+every constituent (isotope, element, molecule or mixture) to the materials
+using it, with its total fraction. Substitutions replace constituents in all substances of a library, e.g. a
+natural element by an enriched one. Only substances, that contain a replaced
+constituent (directly or within one of their constituents), are rebuilt. All
+other substances and subtrees are shared with the original library.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import Literal, Union
+
+from .isotope import Isotope
+from .substance import Substance
+from .element import Element
+from .molecule import Molecule
+from .mixture import Mixture
+from .conversion import wt_to_at, vol_to_at
+
+
+Constituent = Union[Substance, Isotope]
+
+
+class MaterialLibrary:
+    """Collection of materials with a reverse index of their constituents.
+
+    For every registered material, the total fraction of each contained
+    isotope, element, molecule and mixture is calculated once on registration,
+    in atomic and weight fractions. Isotopes and elements are indexed with
+    their fraction in the isotopic and elemental composition of the material
+    (see `get_isotopes()` and `get_elements()`). Molecules and mixtures are
+    indexed with the product of their fractions along all paths through the
+    tree of the material. Queries are answered from the index without
+    evaluating any material.
+    """
+
+    def __init__(self, materials: Iterable[Substance] = ()) -> None:
+        """Constructor of material library.
+
+        Args:
+            materials:
+                Materials to be registered.
+        """
+
+        self._materials: dict[str, Substance] = {}  # {name: material}
+        self._index: dict[bool, dict[Constituent, dict[Substance, float]]] = {False: {}, True: {}}  # {by_weight: {constituent: {material: fraction}}}
+        self._contents: dict[str, tuple[dict[Constituent, float], dict[Constituent, float]]] = {}  # {name: (atomic, weight)}
+
+        self.register_many(materials)
+
+
+    # ########
+    # Collection
+    # ########
+
+    def register(self, material: Substance) -> None:
+        """Registers a material and indexes its constituents.
+
+        A registered material with the same name is replaced.
+        """
+
+        if material._name in self._materials:
+            self.unregister(self._materials[material._name])
+
+        contents = (self._contributions(material, False), self._contributions(material, True))
+        for by_weight, contributions in zip((False, True), contents):
+            index = self._index[by_weight]
+            for constituent, fraction in contributions.items():
+                index.setdefault(constituent, {})[material] = fraction
+
+        self._materials[material._name] = material
+        self._contents[material._name] = contents
+
+    def register_many(self, materials: Iterable[Substance]) -> None:
+        """Registers a collection of materials (see `register()`)."""
+        for material in materials:
+            self.register(material)
+
+    def unregister(self, material: Substance) -> None:
+        """Removes a material and its entries of the index.
+
+        Raises:
+            KeyError: If the material is not registered.
+        """
+
+        try:
+            contents = self._contents.pop(material._name)
+        except KeyError:
+            raise KeyError(f"Material \"{material._name}\" is not registered.") from None
+        registered = self._materials.pop(material._name)
+
+        for by_weight, contributions in zip((False, True), contents):
+            index = self._index[by_weight]
+            for constituent in contributions:
+                users = index[constituent]
+                del users[registered]
+                if not users:
+                    del index[constituent]
+
+    def get(self, name: str) -> Substance:
+        """Returns the registered material with given name.
+
+        Raises:
+            KeyError: If no material with this name is registered.
+        """
+        try:
+            return self._materials[name]
+        except KeyError:
+            raise KeyError(f"Material \"{name}\" is not registered.") from None
+
+    @staticmethod
+    def _contributions(material: Substance, by_weight: bool) -> dict[Constituent, float]:
+        """Returns total fraction of every isotope, element, molecule and mixture in a material."""
+
+        mode = "weight" if by_weight else "atomic"
+        contributions: dict[Constituent, float] = {}
+        contributions.update(material.get_isotopes(mode))
+        contributions.update(material.get_elements(mode))
+
+        # molecules and mixtures: product of fractions along all paths
+        stack = [(material, 1.0)]
+        while stack:
+            substance, f_parent = stack.pop()
+            if not isinstance(substance, Mixture):
+                continue
+            fractions = substance._fractions_in_wt() if by_weight else substance._fractions
+            for constituent, f_i in zip(substance._constituents, fractions):
+                if isinstance(constituent, Element):
+                    continue
+                contributions[constituent] = contributions.get(constituent, 0.0) + f_parent*f_i
+                stack.append((constituent, f_parent*f_i))
+
+        return contributions
+
+
+    # ########
+    # Queries
+    # ########
+
+    def materials_containing(
+            self, constituent: Constituent, above: float = 0.0,
+            mode: Literal["atomic", "weight"] = "atomic"
+        ) -> dict[Substance, float]:
+        """Returns all materials, that contain a constituent above a given fraction.
+
+        Args:
+            constituent:
+                Isotope, element, molecule or mixture.
+            above:
+                Materials with a fraction of the constituent not exceeding
+                this value are omitted.
+            mode:
+                Wether 'atomic' or 'weight' fractions are to be compared and
+                fetched.
+
+        Returns:
+            Dictionary that maps materials to the total fraction of the
+            constituent, in descending order of the fraction.
+
+        Raises:
+            ValueError: If mode is not supported.
+        """
+
+        users = self._index[self._by_weight(mode)].get(constituent, {})
+        return dict(sorted(
+            ((material, fraction) for material, fraction in users.items() if fraction > above),
+            key=lambda item: item[1], reverse=True
+        ))
+
+    def dependents(self, constituent: Constituent) -> list[Substance]:
+        """Returns all materials, that contain a constituent (directly or nested)."""
+        return list(self._index[False].get(constituent, ()))
+
+    def fraction(
+            self, material: Substance, constituent: Constituent,
+            mode: Literal["atomic", "weight"] = "atomic"
+        ) -> float:
+        """Returns the total fraction of a constituent in a registered material (zero if not contained).
+
+        Raises:
+            KeyError: If the material is not registered.
+            ValueError: If mode is not supported.
+        """
+        by_weight = self._by_weight(mode)
+        try:
+            contents = self._contents[material._name]
+        except KeyError:
+            raise KeyError(f"Material \"{material._name}\" is not registered.") from None
+        return contents[by_weight].get(constituent, 0.0)
+
+    @staticmethod
+    def _by_weight(mode: str) -> bool:
+        """Returns flag for weight fractions of given mode."""
+        if mode in {"atomic", "at", "mole", "mol"}:
+            return False
+        elif mode in {"weight", "wt"}:
+            return True
+        else:
+            raise ValueError(f"Mode \"{mode}\" not supported for material library queries.")
+
+
+    # ########
+    # Substitution
+    # ########
+
+    def substitute(
+            self, replacements: dict[Constituent, Constituent],
+            mode: Literal["atomic", "weight", "volume"] = "atomic"
+        ) -> list[Substance]:
+        """Replaces constituents in all registered materials (see `substitute()`).
+
+        Only materials, that depend on a replaced constituent, are rebuilt and
+        indexed again.
+
+        Returns:
+            List of rebuilt materials.
+        """
+
+        affected = {
+            material._name: material
+            for constituent in replacements
+            for material in self.dependents(constituent)
+        }
+        rebuilt = substitute(affected.values(), replacements, mode)
+        for material in rebuilt:
+            self.register(material)
+        return rebuilt
+
+
+    # ########
+    # Operators
+    # ########
+
+    def __len__(self) -> int:
+        return len(self._materials)
+
+    def __iter__(self) -> Iterator[Substance]:
+        return iter(self._materials.values())
+
+    def __contains__(self, material: Substance) -> bool:
+        try:
+            return self._materials.get(material._name) is material
+        except AttributeError:
+            return False
+
+
+def _parent_index(substances: Iterable[Substance]) -> tuple[dict[int, Substance], dict[int, list[Substance]]]:
+    """Returns all substances of the trees and the parents of each constituent.
+
+    Both dictionaries are keyed by the id of the substance or constituent, as
+    different objects may compare equal. Isotopes are indexed as constituents,
+    but not traversed.
+    """
+
+    nodes: dict[int, Substance] = {}  # {id: substance}
+    parents: dict[int, list[Substance]] = {}  # {id of constituent: [parent, ...]}
+    stack = [substance for substance in substances]
+    while stack:
+        substance = stack.pop()
+        if id(substance) in nodes:
+            continue
+        nodes[id(substance)] = substance
+        for constituent in substance._constituents:
+            parents.setdefault(id(constituent), []).append(substance)
+            if isinstance(constituent, Substance):
+                stack.append(constituent)
+    return nodes, parents
+
+def substitute(
+        substances: Iterable[Substance], replacements: dict[Constituent, Constituent],
+        mode: Literal["atomic", "weight", "volume"] = "atomic"
+    ) -> list[Substance]:
+    """Replaces constituents in a collection of substances.
+
+    Every substance, that contains a constituent to be replaced (directly or
+    within one of its constituents), is rebuilt with the replacement. Rebuilt
+    substances keep their name, symbol and the fraction of the replaced
+    constituent in the given mode. Substances, that are not affected, are
+    returned unchanged and unchanged subtrees are shared by the rebuilt
+    substances. Molar mass and density are kept, if they were given
+    explicitly, otherwise they are calculated for the new composition.
+    Elements keep their natural flag, molecules their number of atoms.
+
+    Args:
+        substances:
+            Substances of the library.
+        replacements:
+            Dictionary that maps constituents to their replacement.
+        mode:
+            Wether 'atomic', 'weight' or 'volume' fractions of replaced
+            constituents are kept.
+
+    Returns:
+        List of substances in the order given, with substitutions applied.
+
+    Raises:
+        ValueError: If non-valid mode or a replacement is not allowed as
+        constituent of a substance.
+    """
+
+    if not (mode in {"atomic", "at", "mole", "mol"} or mode in {"weight", "wt"} or mode in {"volume", "vol"}):
+        raise ValueError(f"Unknown substitution mode \"{mode}\".")
+
+    substances = list(substances)
+    nodes, parents = _parent_index(substances)
+
+    # affected substances: parents of replaced constituents and all their ancestors
+    stack = [
+        substance
+        for substance in nodes.values()
+        if any(constituent in replacements for constituent in substance._constituents)
+    ]
+    affected: set[int] = set()  # {id of substance}
+    while stack:
+        substance = stack.pop()
+        if id(substance) not in affected:
+            affected.add(id(substance))
+            stack.extend(parents.get(id(substance), ()))
+
+    rebuilt: dict[int, Substance] = {}  # {id of original: rebuilt substance}
+
+    def rebuild(substance: Substance) -> Substance:
+        """Returns the substance with substitutions applied."""
+
+        if substance in replacements:
+            return replacements[substance]
+        if id(substance) not in affected:
+            return substance
+        try:
+            return rebuilt[id(substance)]
+        except KeyError:
+            pass
+
+        new_constituents = [
+            rebuild(constituent) if isinstance(constituent, Substance) else replacements.get(constituent, constituent)
+            for constituent in substance._constituents
+        ]
+        substance._check_constituents(new_constituents)
+
+        # fractions in kept mode, merged if a replacement is already present
+        if isinstance(substance, Molecule) or mode in {"atomic", "at", "mole", "mol"}:
+            fractions = substance._fractions
+        elif mode in {"weight", "wt"}:
+            fractions = substance._fractions_in_wt()
+        else:
+            fractions = list(substance.get_composition_in_vol().values())
+        merged: dict[Constituent, float] = {}
+        for constituent, f_i in zip(new_constituents, fractions):
+            merged[constituent] = merged.get(constituent, 0.0) + f_i
+
+        if isinstance(substance, Molecule) or mode in {"atomic", "at", "mole", "mol"}:
+            x = list(merged.values())
+        elif mode in {"weight", "wt"}:
+            x = wt_to_at(list(merged.values()), [constituent.M for constituent in merged])
+        else:
+            x = vol_to_at(list(merged.values()), [constituent.V_m for constituent in merged])
+        x_sum = sum(x)
+
+        kwargs = {"symbol": substance._symbol, "M": substance._M, "rho": substance._rho}  # given values only
+        if isinstance(substance, Element):
+            kwargs["natural"] = substance.is_natural
+        if isinstance(substance, Molecule):
+            kwargs["atoms"] = substance._atoms
+
+        new = substance.from_trusted(
+            substance._name, {constituent: x_i / x_sum for constituent, x_i in zip(merged, x)}, **kwargs
+        )
+        rebuilt[id(substance)] = new
+        return new
+
+    return [rebuild(substance) for substance in substances]
@@ -3,8 +3,13 @@
 Mixture class is the top class, but may serve as a constituent for itself.
 """
 
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+from itertools import zip_longest
 from typing import Union, TypeAlias
 
+from .conversion import wt_to_at, vol_to_at
 from .substance import Substance
 from .element import Element
 from .molecule import Molecule
@@ -24,6 +29,8 @@ class Mixture(Substance):
     @classmethod
     def _get_allowed_constituents(cls):
         return (Mixture, Molecule, Element)
+
+    __slots__ = ()
     
     def __init__(self, name: str, composition: dict[Constituent, float], mode: str = "_legacy", **kwargs) -> None:
         """Constructor of mixture.
@@ -60,14 +67,225 @@ class Mixture(Substance):
 
         super().__init__(name=name, composition=composition, mode=mode, **kwargs)
 
-        if self._rho == 0.0:
-            self._rho = self._calc_rho()
+    # override
+    def _setup(self, name: str, composition: dict[Constituent, float], **kwargs) -> None:
+
+        super()._setup(name, composition, **kwargs)
+
+        if self._rho == 0.0:  # calculate density on first access
+            self._rho = None
+
+
+    # ########
+    # Factory Constructor
+    # ########
+
+    @classmethod
+    def many_from_matrix(
+            cls, names: Iterable[str], constituents: Sequence[Constituent],
+            fractions: Iterable[Sequence[float]], mode: str = "atomic", **kwargs
+        ) -> list[Mixture]:
+        """Constructor for many mixtures, that share the same constituents.
+
+        The conversion factors of the constituents are evaluated once for all
+        mixtures. Each row of fractions is converted to atomic fractions and
+        normalised, then the mixture is created with `from_trusted()`.
+        Constituents with a fraction of zero are omitted in the respective
+        mixture.
+
+        Args:
+            names:
+                Descriptive name of each mixture.
+            constituents:
+                Constituents shared by all mixtures.
+            fractions:
+                Rows of fractions (one row per mixture, one column per
+                constituent), interpreted according to the given mode.
+            mode:
+                Fractions can be interpreted as atomic, weight or volumetric
+                fractions.
+            **kwargs:
+                Keyword arguments to override values of all mixtures.
+        
+        Keyword Args:
+            M (float):
+                Set molar mass.
+            rho (float):
+                Set density.
+            symbol (str):
+                Short symbol.
+
+        Returns:
+            List of mixture instances.
+
+        Raises:
+            ValueError: If non-valid constructor mode, given constituent is
+            not allowed, the number of names and rows differs, a row does not
+            match the constituents or is all zero, or conversion is not
+            possible.
+        """
+
+        constituents = tuple(constituents)
+        cls._check_constituents(constituents)
+
+        # factors to convert fractions of each constituent to (unnormalised) atomic fractions
+        if mode in {"atomic", "at", "mole", "mol"}:
+            factors = [1.0 for constituent in constituents]
+        elif mode in {"weight", "wt"}:
+            if not all(constituent.M for constituent in constituents):
+                raise ValueError(f"One of the constituents does not have a molar mass.")
+            factors = [1.0 / constituent.M for constituent in constituents]
+        elif mode in {"volume", "vol"}:
+            if not all(constituent.V_m for constituent in constituents):
+                raise ValueError(f"One of the constituents does not have a molar volume.")
+            factors = [1.0 / constituent.V_m for constituent in constituents]
+        else:
+            raise ValueError(f"Unknown constructor mode \"{mode}\".")
+
+        mixtures = []
+        for name, row in zip_longest(names, fractions, fillvalue=None):
+            if name is None or row is None:
+                raise ValueError(f"Number of names and rows of fractions of {cls.__name__} objects must match.")
+            if len(row) != len(constituents):
+                raise ValueError(f"Fractions of {cls.__name__} \"{name}\" must match the number of constituents.")
+            x = [abs(f_i)*c_i for f_i, c_i in zip(row, factors)]
+            x_sum = sum(x)
+            if x_sum <= 0:
+                raise ValueError(f"Fractions of {cls.__name__} \"{name}\" must not all be zero.")
+            composition = {constituent: x_i / x_sum for constituent, x_i in zip(constituents, x) if x_i > 0}
+            mixtures.append(cls.from_trusted(name, composition, **kwargs))
+
+        return mixtures
+
+
+    # ########
+    # Derivation
+    # ########
+
+    def with_fraction(
+            self, constituent: Constituent, fraction: float, mode: str = "atomic",
+            name: str = None, **kwargs
+        ) -> Mixture:
+        """Derives a mixture, in which one constituent has a new fraction.
+
+        The fractions of all other constituents are scaled, so that they keep
+        their ratios among each other. A constituent, that is not part of the
+        mixture, is added and a fraction of zero removes the constituent.
+        Cached compositions of this mixture are updated for the new mixture by
+        a rank-one correction with the cached composition of the constituent,
+        instead of evaluating all constituents again.
+
+        Args:
+            constituent:
+                Constituent to change.
+            fraction:
+                New fraction of the constituent, interpreted according to the
+                given mode.
+            mode:
+                Fraction can be interpreted as atomic, weight or volumetric
+                fraction.
+            name:
+                Descriptive name of the new mixture. Defaults to the name of
+                this mixture, followed by the constituent and its new fraction
+                (names identify substances, so it must differ from this one).
+            **kwargs:
+                Keyword arguments to override values of the new mixture.
+        
+        Keyword Args:
+            M (float):
+                Set molar mass.
+            rho (float):
+                Set density.
+            symbol (str):
+                Short symbol.
+
+        Returns:
+            Mixture instance.
+
+        Raises:
+            ValueError: If non-valid mode or fraction, given constituent is
+            not allowed or the other constituents cannot be scaled.
+        """
+
+        self._check_constituents((constituent,))
+        if not 0.0 <= fraction <= 1.0:
+            raise ValueError(f"Fraction of constituent must be between zero and one.")
+
+        constituents = list(self._constituents)
+        x_old = list(self._fractions)
+        if constituent in constituents:
+            k = constituents.index(constituent)
+        else:
+            k = len(constituents)
+            constituents.append(constituent)
+            x_old.append(0.0)
+
+        # fractions in given mode, scaling of all other constituents and conversion to atomic fractions
+        if mode in {"atomic", "at", "mole", "mol"}:
+            f_old = x_old
+        elif mode in {"weight", "wt"}:
+            f_old = [x_i*c.M for x_i, c in zip(x_old, constituents)]
+        elif mode in {"volume", "vol"}:
+            f_old = [x_i*c.V_m for x_i, c in zip(x_old, constituents)]
+        else:
+            raise ValueError(f"Unknown constructor mode \"{mode}\".")
+        f_sum = sum(f_old)
+        f_rest = f_sum - f_old[k]
+        if f_rest <= 0.0 and fraction < 1.0:
+            raise ValueError(f"Could not scale constituents of {self.__class__.__name__} \"{self._name}\", as there are no others.")
+        scale = (1.0 - fraction) / f_rest*f_sum if f_rest > 0.0 else 0.0
+        f_new = [f_i/f_sum*scale for f_i in f_old]
+        f_new[k] = fraction
+
+        if mode in {"weight", "wt"}:
+            x_new = wt_to_at(f_new, [c.M for c in constituents])
+        elif mode in {"volume", "vol"}:
+            x_new = vol_to_at(f_new, [c.V_m for c in constituents])
+        else:
+            x_new = f_new
+
+        if name is None:
+            name = f"{self._name} ({constituent.name}: {fraction:g} {mode})"
+        new = self.from_trusted(
+            name,
+            {c: x_i for c, x_i in zip(constituents, x_new) if x_i > 0},
+            **kwargs
+        )
+
+        # rank-one update of cached compositions (not for removal or a pure constituent, which would leave residues)
+        if 0.0 < x_new[k] < 1.0 and x_old[k] < 1.0:
+            t = (1.0 - x_new[k]) / (1.0 - x_old[k])  # common scaling of atomic fractions of all others
+            M_old = M_new = None  # molar masses (per atom) for scaling of weight fractions, only if needed
+            for key, raw in list(self._cache.items()):
+                if not isinstance(key, tuple) or key[0] not in {"elements", "isotopes"}:
+                    continue
+                kind, by_weight, *natural_keys = key
+                if by_weight:
+                    if M_old is None:
+                        M_old = sum(x_i*c.M for x_i, c in zip(x_old, constituents))
+                        M_new = t*(M_old - x_old[k]*constituent.M) + x_new[k]*constituent.M
+                    u = t*M_old / M_new
+                    g_old, g_new = x_old[k]*constituent.M / M_old, x_new[k]*constituent.M / M_new
+                else:
+                    u = t
+                    g_old, g_new = x_old[k], x_new[k]
+                if kind == "elements":
+                    raw_k = constituent._raw_elements(by_weight)
+                else:
+                    raw_k = constituent._raw_isotopes(by_weight, *natural_keys)
+                updated = {item: u*f_j for item, f_j in raw.items()}
+                for item, f_j in raw_k.items():
+                    updated[item] = updated.get(item, 0.0) + (g_new - u*g_old)*f_j
+                new._cache[key] = updated
+
+        return new
 
 
     # ########
     # Quantity Calculation
     # ########
 
+    # override
     def _calc_rho(self) -> float:
         r"""Calculates average density.
         
@@ -76,13 +294,13 @@ class Mixture(Substance):
             $$\overline{\rho} = \left( \sum_i \frac{w_i}{\rho_i} \right)^{-1}$$
         Will return zero if calculation is not possible.
         """
-        if all(constituent.M > 0 for constituent in self._composition.keys()):
-            wt_composition = self.get_composition_in_wt()
+        if all(constituent.M > 0 for constituent in self._constituents):
+            wt_fracs = self._fractions_in_wt()
         else:
             return 0.0
 
-        if all(constituent.rho > 0 for constituent in wt_composition.keys()):
-            summed = sum(w_i / constituent.rho for constituent, w_i in wt_composition.items())
+        if all(constituent.rho > 0 for constituent in self._constituents):
+            summed = sum(w_i / constituent.rho for constituent, w_i in zip(self._constituents, wt_fracs))
             return summed**-1
         else:
             return 0.0
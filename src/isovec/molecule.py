@@ -3,6 +3,11 @@
 Molecule class serves as constituents for `Mixture`.
 """
 
+from __future__ import annotations
+
+from collections.abc import Sequence
+import math
+
 from .substance import Substance
 from .element import Element
 
@@ -21,6 +26,8 @@ class Molecule(Substance):
     def _get_allowed_constituents(cls):
         return (Element,)
 
+    __slots__ = ("_atoms", "_atom_counts")
+
     def __init__(self, name: str, composition: dict[Element, float], mode: str = "_legacy", **kwargs) -> None:
         """Constructor of molecule.
         
@@ -51,9 +58,20 @@ class Molecule(Substance):
             not an element.
         """
 
-        self._atoms: int = int(sum(composition.values()))  # number of atoms in molecule
+        atoms = int(sum(composition.values()))  # number of atoms in molecule
 
-        super().__init__(name=name, composition=composition, mode=mode, **kwargs)
+        super().__init__(name=name, composition=composition, mode=mode, atoms=atoms, **kwargs)
+
+    # override
+    def _setup(self, name: str, composition: dict[Element, float], atoms: int = None, **kwargs) -> None:
+
+        if atoms is None:  # counts cannot be reconstructed from normalised fractions alone
+            raise ValueError(f"Number of atoms of {self.__class__.__name__} \"{name}\" must be given (keyword `atoms`).")
+
+        super()._setup(name, composition, **kwargs)
+
+        self._atoms: int = atoms  # number of atoms in molecule
+        self._atom_counts: tuple[int, ...] = tuple(round(x_i*atoms) for x_i in self._fractions)  # number of atoms per element
 
         # construct symbol
         if not self._symbol:
@@ -98,36 +116,58 @@ class Molecule(Substance):
             $$\overline{M} = \sum_i \left( N_i \cdot M_i \right)$$
         Will return zero if calculation is not possible.
         """
-        if all(constituent.M > 0 for constituent in self._composition.keys()):
-            return sum(N_i*constituent.M for constituent, N_i in self.get_composition_in_atoms().items())
+        if all(constituent.M > 0 for constituent in self._constituents):
+            return sum(N_i*constituent.M for constituent, N_i in zip(self._constituents, self._atom_counts))
         else:
             return 0.0
 
 
+    # ########
+    # Functions
+    # ########
+
+    # override
+    def validate(self, recursive: bool = False) -> None:
+        super().validate(recursive)
+        if self._atoms < 1:
+            raise ValueError(f"{self.__class__.__name__} \"{self._name}\" must contain at least one atom.")
+        if not all(N_i >= 1 for N_i in self._atom_counts) or sum(self._atom_counts) != self._atoms:
+            raise ValueError(f"Number of atoms per element of {self.__class__.__name__} \"{self._name}\" must be positive and add up to {self._atoms}.")
+        if not all(math.isclose(N_i/self._atoms, x_i, rel_tol=1e-9) for N_i, x_i in zip(self._atom_counts, self._fractions)):
+            raise ValueError(f"Fractions of {self.__class__.__name__} \"{self._name}\" must match the number of atoms per element.")
+
+
     # ########
     # Conversion
     # ########
 
     def get_composition_in_atoms(self) -> dict[Element, float]:
         """Returns constituents with their number of atoms."""
-        return {element: int(x_i*self._atoms) for element, x_i in self._composition.items()}
+        return dict(zip(self._constituents, self._atom_counts))
 
 
     # ########
     # Collection
     # ########
 
+    # override
+    def _gathering_fractions(self, by_weight: bool = False) -> Sequence[float]:
+        if not by_weight:
+            return self._atom_counts
+        else:
+            return self._fractions_in_wt()
+
     # override
     def _append_elements(self, element_list: dict[int, tuple[Substance, float]], by_weight: bool = False, f_p: float = 1.0):
 
         element_list[-1] = element_list[-1] + 1  # increase counter
 
         if not by_weight:
-            composition = self.get_composition_in_atoms()
+            fractions = self._atom_counts
         else:
-            composition = self.get_composition_in_wt()  
+            fractions = self._fractions_in_wt()
         
-        for constituent, f_i in composition.items():
+        for constituent, f_i in zip(self._constituents, fractions):
             constituent._append_elements(element_list, by_weight, f_p*f_i)
 
         return element_list
@@ -0,0 +1,216 @@
+"""Class for NuclideTable.
+
+The NuclideTable class holds the properties of the isotope library as columns
+(structure of arrays), sorted by ZAI notation. It allows fast range queries over
+atomic number, neutron number and mass number. `nuclide_table` is the table of
+the whole library (without surrogate isotopes of natural elements).
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from .isotope import Isotope
+from .registry import isotope_registry
+from .elements import _natural_elements
+
+
+class NuclideTable:
+    """Columnar table of isotopes.
+
+    Each column is an array with one entry per isotope, in ascending order of
+    the ZAI notation: atomic number `Z`, mass number `A`, isomeric state `I`,
+    neutron number `N`, relative atomic mass `A_r`, molar mass `M` and natural
+    abundance `abundance` (atomic fraction in the natural element, zero if not
+    naturally occurring). The corresponding `Isotope` objects are stored in
+    `isotopes`. Queries return row indices or isotopes.
+    """
+
+    def __init__(self, isotopes: Iterable[Isotope], abundances: dict[Isotope, float] = None) -> None:
+        """Constructor of nuclide table.
+
+        Args:
+            isotopes:
+                Isotopes of the table.
+            abundances:
+                Natural abundance (atomic fraction) of isotopes.
+        """
+
+        if abundances is None:
+            abundances = {}
+
+        self._isotopes: tuple[Isotope, ...] = tuple(sorted(isotopes, key=lambda isotope: isotope.ZAI))
+
+        self._ZAI = array("q", (isotope.ZAI for isotope in self._isotopes))
+        self._Z = array("i", (isotope.Z for isotope in self._isotopes))
+        self._A = array("i", (isotope.A for isotope in self._isotopes))
+        self._I = array("i", (isotope.I for isotope in self._isotopes))
+        self._N = array("i", (isotope.N for isotope in self._isotopes))
+        self._A_r = array("d", (isotope.A_r for isotope in self._isotopes))
+        self._M = array("d", (isotope.M for isotope in self._isotopes))
+        self._abundance = array("d", (abundances.get(isotope, 0.0) for isotope in self._isotopes))
+
+        # secondary orders for range queries over neutron and mass number
+        self._order_N = sorted(range(len(self._isotopes)), key=lambda i: (self._N[i], i))
+        self._sorted_N = [self._N[i] for i in self._order_N]
+        self._order_A = sorted(range(len(self._isotopes)), key=lambda i: (self._A[i], i))
+        self._sorted_A = [self._A[i] for i in self._order_A]
+
+
+    # ########
+    # Properties
+    # ########
+
+    @property
+    def isotopes(self):
+        """Isotopes of the table."""
+        return self._isotopes
+
+    @property
+    def ZAI(self):
+        """ZAI notations."""
+        return self._ZAI
+
+    @property
+    def Z(self):
+        """Atomic numbers (number of protons)."""
+        return self._Z
+
+    @property
+    def A(self):
+        """Mass numbers (number of protons + neutrons)."""
+        return self._A
+
+    @property
+    def I(self):
+        """Isomeric states."""
+        return self._I
+
+    @property
+    def N(self):
+        """Neutron numbers (number of neutrons)."""
+        return self._N
+
+    @property
+    def A_r(self):
+        """Relative atomic masses (atomic weight) [-]."""
+        return self._A_r
+
+    @property
+    def M(self):
+        """Molar masses [g mol^-1]."""
+        return self._M
+
+    @property
+    def abundance(self):
+        """Natural abundances (atomic fraction in natural element)."""
+        return self._abundance
+
+
+    # ########
+    # Queries
+    # ########
+
+    def index(self, isotope: Isotope) -> int:
+        """Returns the row index of an isotope.
+
+        Raises:
+            KeyError: If the isotope is not in the table.
+        """
+        i = bisect_left(self._ZAI, isotope.ZAI)
+        if i < len(self._ZAI) and self._ZAI[i] == isotope.ZAI:
+            return i
+        raise KeyError(f"Isotope \"{isotope}\" is not in the table.")
+
+    def indices_by_Z(self, Z: int) -> range:
+        """Returns row indices of all isotopes with atomic number Z."""
+        return range(bisect_left(self._ZAI, Z*10000), bisect_left(self._ZAI, (Z + 1)*10000))
+
+    def indices_by_N(self, N_min: int, N_max: int = None) -> list[int]:
+        """Returns row indices of all isotopes with neutron number in [N_min, N_max].
+
+        If `N_max` is omitted, only isotones with `N_min` are returned.
+        """
+        return self._range_query(self._sorted_N, self._order_N, N_min, N_min if N_max is None else N_max)
+
+    def indices_by_A(self, A_min: int, A_max: int = None) -> list[int]:
+        """Returns row indices of all isotopes with mass number in [A_min, A_max].
+
+        If `A_max` is omitted, only isobars with `A_min` are returned.
+        """
+        return self._range_query(self._sorted_A, self._order_A, A_min, A_min if A_max is None else A_max)
+
+    def indices_natural(self) -> list[int]:
+        """Returns row indices of all naturally occurring isotopes."""
+        return [i for i, abundance in enumerate(self._abundance) if abundance > 0]
+
+    def by_Z(self, Z: int) -> list[Isotope]:
+        """Returns all isotopes with atomic number Z."""
+        indices = self.indices_by_Z(Z)
+        return list(self._isotopes[indices.start:indices.stop])
+
+    def by_N(self, N_min: int, N_max: int = None) -> list[Isotope]:
+        """Returns all isotopes with neutron number in [N_min, N_max] (isotones)."""
+        return self.take(self.indices_by_N(N_min, N_max))
+
+    def by_A(self, A_min: int, A_max: int = None) -> list[Isotope]:
+        """Returns all isotopes with mass number in [A_min, A_max] (isobars)."""
+        return self.take(self.indices_by_A(A_min, A_max))
+
+    def natural(self) -> list[Isotope]:
+        """Returns all naturally occurring isotopes."""
+        return self.take(self.indices_natural())
+
+    def take(self, indices: Iterable[int]) -> list[Isotope]:
+        """Returns the isotopes at given row indices."""
+        return [self._isotopes[i] for i in indices]
+
+    @staticmethod
+    def _range_query(sorted_keys: Sequence[int], order: Sequence[int], lo: int, hi: int) -> list[int]:
+        """Returns row indices (ascending) with key in [lo, hi] via bisection of the sorted keys."""
+        return sorted(order[bisect_left(sorted_keys, lo):bisect_right(sorted_keys, hi)])
+
+
+    # ########
+    # Export
+    # ########
+
+    def columns(self) -> dict[str, array]:
+        """Returns dictionary of column names and arrays."""
+        return {
+            "ZAI": self._ZAI, "Z": self._Z, "A": self._A, "I": self._I, "N": self._N,
+            "A_r": self._A_r, "M": self._M, "abundance": self._abundance,
+        }
+
+    def as_numpy(self) -> dict[str, Any]:
+        """Returns dictionary of column names and NumPy arrays (zero-copy views).
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        try:
+            import numpy as np
+        except ImportError as ex:
+            raise ImportError("NumPy is required for NumPy views of the nuclide table.") from ex
+        return {name: np.frombuffer(column, dtype=np.dtype(column.typecode)) for name, column in self.columns().items()}
+
+
+    # ########
+    # Operators
+    # ########
+
+    def __len__(self) -> int:
+        return len(self._isotopes)
+
+    def __iter__(self):
+        return iter(self._isotopes)
+
+
+nuclide_table = NuclideTable(
+    (isotope for isotope in isotope_registry if isotope.A > 0),
+    {isotope: x_i for element in _natural_elements.values() for isotope, x_i in zip(element.constituents, element.fractions)}
+)
+"""Table of all isotopes of the library with their natural abundances."""
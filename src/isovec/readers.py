@@ -0,0 +1,160 @@
+"""Functions for reading material definitions of transport codes.
+
+Material cards ("m" cards) of MCNP input decks are read in a single pass over
+the lines of a file handle, keeping only the current card in memory. ZAIDs are
+resolved with the indexed `isotope_registry`, natural ZAIDs (e.g. "26000") with
+the natural elements of the library.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import re
+
+from .constants import ATOM_NUMB_TO_SYMBOL
+from .isotope import Isotope
+from .element import Element
+from .mixture import Mixture
+from .registry import isotope_registry
+from .elements import _natural_elements
+
+
+_MATERIAL_CARD = re.compile(r"^\s{0,4}m(\d+)(?:\s|$)", re.IGNORECASE)
+"""Pattern for the start of a material card, e.g. "m1" or "M100"."""
+
+_COMMENT_CARD = re.compile(r"^\s{0,4}c(?:\s|$)", re.IGNORECASE)
+"""Pattern for comment cards."""
+
+_KEYWORD = re.compile(r"[a-z]\w*\s*=\s*\S+", re.IGNORECASE)
+"""Pattern for keywords of material cards, e.g. "nlib=80c" or "nlib = 80c"."""
+
+
+def read_mcnp_vectors(lines: Iterable[str]) -> Iterator[tuple[int, dict[Isotope, float], str]]:
+    """Yields isotope vectors of all material cards of an MCNP input.
+
+    Natural ZAIDs are mapped to the surrogate isotopes of the natural elements
+    (mass number of zero). Fractions are returned as given, but positive.
+    Keywords (e.g. "nlib=80c") are ignored, cards without entries (e.g. the
+    default card "m0") are skipped.
+
+    Args:
+        lines:
+            Lines of the input, e.g. a text file handle.
+
+    Yields:
+        Tuple of material number, dictionary that maps isotopes to their
+        fraction and mode of the fractions ('atomic' or 'weight').
+
+    Raises:
+        ValueError: If a card could not be interpreted or mixes atomic and
+        weight fractions.
+        KeyError: If an isotope is not registered.
+    """
+
+    resolved: dict[str, Isotope] = {}  # {ZAID token: isotope}
+
+    def resolve(token: str) -> Isotope:
+        try:
+            return resolved[token]
+        except KeyError:
+            try:
+                za = int(token.split(".", 1)[0])
+            except ValueError:
+                raise ValueError(f"Could not interpret ZAID \"{token}\".") from None
+            isotope = isotope_registry._by_mcnp_za(za)
+            resolved[token] = isotope
+            return isotope
+
+    for number, tokens in _material_cards(lines):
+        entries = _KEYWORD.sub(" ", " ".join(tokens)).split()
+        if not entries:
+            continue
+        if len(entries) % 2:
+            raise ValueError(f"Material card m{number} has an odd number of entries.")
+
+        vector: dict[Isotope, float] = {}
+        signs = set()
+        for token, value in zip(entries[::2], entries[1::2]):
+            fraction = float(value)
+            signs.add(fraction < 0)
+            isotope = resolve(token)
+            vector[isotope] = vector.get(isotope, 0.0) + abs(fraction)
+        if len(signs) > 1:
+            raise ValueError(f"Material card m{number} mixes atomic and weight fractions.")
+
+        yield number, vector, "weight" if True in signs else "atomic"
+
+def read_mcnp(lines: Iterable[str]) -> Iterator[tuple[int, Mixture]]:
+    """Yields mixtures of all material cards of an MCNP input.
+
+    Each mixture is named after its material card (e.g. "m1") and is made of
+    elements: natural ZAIDs are mapped to the natural elements of the library,
+    isotopes of the same atomic number are combined to a new element.
+
+    Args:
+        lines:
+            Lines of the input, e.g. a text file handle.
+
+    Yields:
+        Tuple of material number and mixture.
+
+    Raises:
+        ValueError: If a card could not be interpreted or mixes atomic and
+        weight fractions.
+        KeyError: If an isotope is not registered or a natural element is
+        not in the library.
+    """
+
+    for number, vector, mode in read_mcnp_vectors(lines):
+        name = f"m{number}"
+
+        by_Z: dict[int, dict[Isotope, float]] = {}  # isotopes (not natural) per atomic number
+        composition: dict[Element, float] = {}
+        for isotope, fraction in vector.items():
+            if isotope.A == 0:
+                try:
+                    element = _natural_elements[isotope.Z]
+                except KeyError:
+                    raise KeyError(f"No natural element with atomic number {isotope.Z} in material card {name}.") from None
+                composition[element] = composition.get(element, 0.0) + fraction
+            else:
+                by_Z.setdefault(isotope.Z, {})[isotope] = fraction
+
+        for Z, isotopes in by_Z.items():
+            element = Element(f"{ATOM_NUMB_TO_SYMBOL[Z]} ({name})", isotopes, mode=mode)
+            composition[element] = composition.get(element, 0.0) + sum(isotopes.values())
+
+        yield number, Mixture(name, composition, mode=mode)
+
+
+def _material_cards(lines: Iterable[str]) -> Iterator[tuple[int, list[str]]]:
+    """Yields number and entries of all material cards (comments removed, continuations joined)."""
+
+    number = None
+    tokens: list[str] = []
+    continued = False  # previous line ended with "&"
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if _COMMENT_CARD.match(line):
+            continue
+        content = line.split("$", 1)[0]
+
+        if number is not None and (continued or line[:5].isspace()) and content.strip():
+            pass  # continuation of current card
+        else:
+            if number is not None:
+                yield number, tokens
+                number, tokens = None, []
+            match = _MATERIAL_CARD.match(content)
+            if not match:
+                continued = False
+                continue
+            number = int(match.group(1))
+            content = content[match.end():]
+
+        content = content.rstrip()
+        continued = content.endswith("&")
+        tokens.extend(content.rstrip("&").split())
+
+    if number is not None:
+        yield number, tokens
@@ -0,0 +1,199 @@
+"""Class for IsotopeRegistry.
+
+The IsotopeRegistry class indexes the library of isotopes by atomic number,
+mass number and isomeric state, so that isotopes can be looked up directly
+instead of accessing the variables of "isotopes.py". `isotope_registry` is the
+registry of the whole library, including the surrogate isotopes of natural
+elements (mass number of zero).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import re
+
+from . import isotopes as _isotopes
+from .isotope import Isotope
+from .constants import ATOM_NUMB_TO_SYMBOL
+
+
+_NOTATION = re.compile(r"^([A-Z][a-z]?)[-_ ]?(\d{1,3}|nat)(?:(m)(\d?)|g)?$", re.IGNORECASE)
+"""Pattern for symbol notations, e.g. "U-235", "U235", "U_235m1" or "U-nat"."""
+
+_ZAID = re.compile(r"^(\d{4,7})(?:\.\w*)?$")
+"""Pattern for numerical notations, e.g. "92235", "922350" or "92235.80c"."""
+
+
+class IsotopeRegistry:
+    """Indexed collection of isotopes.
+
+    Isotopes are stored by their ZAI notation, so that lookups by atomic
+    number (Z), mass number (A) and isomeric state (I), as well as by ZA and ZAI
+    notation are done in constant time. String notations are parsed once and
+    cached.
+    """
+
+    def __init__(self, isotopes: Iterable[Isotope]) -> None:
+        """Constructor of isotope registry.
+
+        Args:
+            isotopes:
+                Isotopes to be registered. For duplicates of the same ZAI, the
+                first isotope is kept.
+        """
+
+        self._by_zai: dict[int, Isotope] = {}  # {ZAI: isotope}
+        for isotope in isotopes:
+            self._by_zai.setdefault(isotope.ZAI, isotope)
+
+        self._symbol_to_Z = {symbol.lower(): Z for Z, symbol in ATOM_NUMB_TO_SYMBOL.items()}
+        self._aliases = {alias: self._by_zai.get(zai) for alias, zai in (("H", 10010), ("D", 10020), ("T", 10030))}
+        self._parse_cache: dict[str, Isotope] = {}  # {notation: isotope}
+
+
+    # ########
+    # Lookup
+    # ########
+
+    def get(self, Z: int, A: int, I: int = 0) -> Isotope:
+        """Returns the isotope with given atomic number, mass number and isomeric state.
+
+        Args:
+            Z:
+                Atomic number.
+            A:
+                Mass number (zero for the surrogate of a natural element).
+            I:
+                Isomeric state.
+
+        Raises:
+            KeyError: If the isotope is not registered.
+        """
+        return self.by_zai(Z*10000 + A*10 + I)
+
+    def by_zai(self, zai: int) -> Isotope:
+        """Returns the isotope with given ZAI notation (Z*10000 + A*10 + I).
+
+        Raises:
+            KeyError: If the isotope is not registered.
+        """
+        try:
+            return self._by_zai[zai]
+        except KeyError:
+            raise KeyError(f"No isotope with ZAI {zai} registered.") from None
+
+    def by_za(self, za: int, I: int = 0) -> Isotope:
+        """Returns the isotope with given ZA notation (Z*1000 + A).
+
+        Args:
+            za:
+                ZA notation.
+            I:
+                Isomeric state.
+
+        Raises:
+            KeyError: If the isotope is not registered.
+        """
+        return self.by_zai(za*10 + I)
+
+    def by_zai_many(self, zais: Iterable[int]) -> list[Isotope]:
+        """Returns the isotopes for a collection of ZAI notations.
+
+        Raises:
+            KeyError: If one of the isotopes is not registered.
+        """
+        by_zai = self._by_zai
+        try:
+            return [by_zai[zai] for zai in zais]
+        except KeyError as ex:
+            raise KeyError(f"No isotope with ZAI {ex.args[0]} registered.") from None
+
+    def parse(self, notation: str) -> Isotope:
+        """Returns the isotope for a string notation.
+
+        Supported are symbol notations like "U-235", "U235", "u_235",
+        "Am-242m", "Am242m1" or "U-nat", ZA notations like "92235", ZAID-style
+        codes like "92235.80c" (with MCNP metastable convention, e.g. "95642")
+        and ZAI notations like "922350". Plain numbers are interpreted as ZA,
+        unless the atomic number would exceed the known elements. The aliases
+        "H", "D" and "T" are supported as well. Results are cached.
+
+        Args:
+            notation:
+                String notation of isotope.
+
+        Raises:
+            ValueError: If the notation could not be interpreted.
+            KeyError: If the isotope is not registered.
+        """
+
+        try:
+            return self._parse_cache[notation]
+        except KeyError:
+            isotope = self._parse(notation.strip())
+            self._parse_cache[notation] = isotope
+            return isotope
+
+    def _parse(self, notation: str) -> Isotope:
+        """Returns the isotope for a stripped string notation (not cached)."""
+
+        if notation in self._aliases:
+            return self._aliases[notation]
+
+        match = _NOTATION.match(notation)
+        if match:
+            symbol, A, metastable, state = match.groups()
+            try:
+                Z = self._symbol_to_Z[symbol.lower()]
+            except KeyError:
+                raise ValueError(f"Unknown element symbol in isotope notation \"{notation}\".") from None
+            A = 0 if A.lower() == "nat" else int(A)
+            I = (int(state) if state else 1) if metastable else 0
+            return self.get(Z, A, I)
+
+        match = _ZAID.match(notation)
+        if match:
+            number = int(match.group(1))
+            if number // 1000 in ATOM_NUMB_TO_SYMBOL:
+                return self._by_mcnp_za(number)
+            else:
+                return self.by_zai(number)
+
+        raise ValueError(f"Could not interpret isotope notation \"{notation}\".")
+
+    def _by_mcnp_za(self, za: int) -> Isotope:
+        """Returns the isotope for a ZA notation with MCNP metastable convention.
+
+        Metastable states are encoded as ZA + 300 + 100*I.
+        """
+
+        Z, A = divmod(za, 1000)
+        if A > 300:  # metastable state
+            for I in range(1, (A - 300)//100 + 1):
+                if (Z*10000 + (A - 300 - 100*I)*10 + I) in self._by_zai:
+                    return self.get(Z, A - 300 - 100*I, I)
+        return self.get(Z, A)
+
+
+    # ########
+    # Operators
+    # ########
+
+    def __len__(self) -> int:
+        return len(self._by_zai)
+
+    def __iter__(self) -> Iterator[Isotope]:
+        return iter(self._by_zai.values())
+
+    def __contains__(self, isotope: Isotope) -> bool:
+        try:
+            return self._by_zai.get(isotope.ZAI) == isotope
+        except AttributeError:
+            return False
+
+
+isotope_registry = IsotopeRegistry([
+    *(obj for obj in vars(_isotopes).values() if isinstance(obj, Isotope)),
+    *_isotopes._natural_compositions.values()
+])
+"""Registry of all isotopes of the library and surrogate isotopes of natural elements."""
@@ -0,0 +1,274 @@
+"""Functions for serialization of substances.
+
+Substances are serialized with all contained substances, each stored once, in
+an order where constituents precede the substances using them. Isotopes are
+referenced by their ZAI notation and the natural elements of the library by
+their atomic number. Atomic fractions are stored as they are, so that loading
+uses `from_trusted()` without any conversion or normalisation.
+
+Two variants are available: JSON (`to_json()`, `from_json()`) for humans and a
+binary format (`to_binary()`, `from_binary()`) for speed. Both are versioned.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+import json
+import math
+import struct
+import sys
+
+from .substance import Substance
+from .element import Element
+from .molecule import Molecule
+from .mixture import Mixture
+from .registry import isotope_registry
+from .elements import _natural_elements
+
+
+FORMAT_VERSION = 1
+"""Version of the serialization formats."""
+
+_TYPES = {"Element": Element, "Molecule": Molecule, "Mixture": Mixture}
+
+# kind of reference (lowest two bits of a reference)
+_SUBSTANCE = 0
+_ISOTOPE = 1
+_NATURAL = 2
+
+_MAGIC = b"ISOVECS\x00"
+_HEADER = struct.Struct("<8sqqqq")  # magic, version, number of substances, number of constituents, number of roots
+
+
+def _flatten(substances: Iterable[Substance]) -> tuple[list[Substance], list[Substance]]:
+    """Returns all contained substances (constituents first) and the given substances.
+
+    Natural elements of the library are omitted, as they are referenced.
+    """
+
+    nodes: list[Substance] = []
+    index: dict[int, int] = {}  # {id of substance: index}
+
+    def visit(substance: Substance) -> None:
+        stack = [(substance, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if id(node) in index:
+                continue
+            if expanded:
+                index[id(node)] = len(nodes)
+                nodes.append(node)
+                continue
+            stack.append((node, True))
+            for constituent in node._constituents:
+                if isinstance(constituent, Substance) and id(constituent) not in index and not _is_library_element(constituent):
+                    stack.append((constituent, False))
+
+    roots = []
+    for substance in substances:
+        if not _is_library_element(substance):
+            visit(substance)
+        roots.append(substance)
+    return nodes, roots
+
+def _is_library_element(substance: Substance) -> bool:
+    """Returns True, if substance is a natural element of the library (same object)."""
+    return isinstance(substance, Element) and _natural_elements.get(substance.Z) is substance
+
+def _reference(constituent, index: dict[int, int]) -> int:
+    """Returns the encoded reference of a constituent.
+
+    Raises:
+        ValueError: If an isotope is not registered, so that it could not be
+        loaded again.
+    """
+    if not isinstance(constituent, Substance):
+        if constituent not in isotope_registry:
+            raise ValueError(f"Isotope \"{constituent.name}\" (ZAI {constituent.ZAI}) is not registered and cannot be serialized.")
+        return constituent.ZAI*4 + _ISOTOPE
+    if _is_library_element(constituent):
+        return constituent.Z*4 + _NATURAL
+    return index[id(constituent)]*4 + _SUBSTANCE
+
+def _records(substances: Iterable[Substance]) -> tuple[list[dict], list[int]]:
+    """Returns records of all contained substances and the references of the given substances."""
+
+    nodes, roots = _flatten(substances)
+    index = {id(node): k for k, node in enumerate(nodes)}
+
+    records = []
+    for node in nodes:
+        record = {
+            "type": node.__class__.__name__,
+            "name": node._name,
+            "symbol": node._symbol,
+            "M": node._M,
+            "rho": node._rho or None,
+            "constituents": [_reference(constituent, index) for constituent in node._constituents],
+            "fractions": list(node._fractions),
+        }
+        if isinstance(node, Element):
+            record["natural"] = node.is_natural
+        if isinstance(node, Molecule):
+            record["atoms"] = node._atoms
+        records.append(record)
+    return records, [_reference(root, index) for root in roots]
+
+def _build(records: Iterable[dict], roots: Iterable[int]) -> list[Substance]:
+    """Returns the substances of the roots (references), built from records with the trusted constructor."""
+
+    built: list[Substance] = []
+
+    def resolve(reference: int):
+        key, kind = divmod(reference, 4)
+        if kind == _SUBSTANCE:
+            return built[key]
+        elif kind == _ISOTOPE:
+            return isotope_registry.by_zai(key)
+        elif kind == _NATURAL:
+            return _natural_elements[key]
+        raise ValueError(f"Unknown kind of reference {kind}.")
+
+    for record in records:
+        try:
+            cls = _TYPES[record["type"]]
+        except KeyError:
+            raise ValueError(f"Unknown type of substance \"{record['type']}\".") from None
+        kwargs = {"symbol": record["symbol"], "M": record["M"], "rho": record["rho"]}
+        if "natural" in record:
+            kwargs["natural"] = record["natural"]
+        if "atoms" in record:
+            kwargs["atoms"] = record["atoms"]
+        composition = dict(zip(map(resolve, record["constituents"]), record["fractions"]))
+        built.append(cls.from_trusted(record["name"], composition, **kwargs))
+
+    return [resolve(root) for root in roots]
+
+
+# JSON
+
+def to_json(substances: Iterable[Substance], indent: int = None) -> str:
+    """Returns JSON serialization of substances.
+
+    Args:
+        substances:
+            Substances to serialize, including all contained substances.
+        indent:
+            Indentation of the JSON document.
+
+    Raises:
+        ValueError: If an isotope is not in `isotope_registry`.
+    """
+    records, roots = _records(substances)
+    return json.dumps({"format": "isovec", "version": FORMAT_VERSION, "substances": records, "roots": roots}, indent=indent)
+
+def from_json(text: str) -> list[Substance]:
+    """Returns substances of a JSON serialization (see `to_json()`).
+
+    Raises:
+        ValueError: If text is not a serialization of a supported version.
+        KeyError: If a referenced isotope or natural element is not in the
+        library.
+    """
+
+    document = json.loads(text)
+    if not isinstance(document, dict) or document.get("format") != "isovec":
+        raise ValueError("Text is not a serialization of substances.")
+    if document.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Serialization version {document.get('version')} is not supported.")
+    return _build(document["substances"], document["roots"])
+
+
+# binary
+
+def to_binary(substances: Iterable[Substance]) -> bytes:
+    """Returns binary serialization of substances.
+
+    Numbers are stored as little endian arrays, texts as UTF-8.
+
+    Args:
+        substances:
+            Substances to serialize, including all contained substances.
+
+    Raises:
+        ValueError: If an isotope is not in `isotope_registry`.
+    """
+
+    records, roots = _records(substances)
+    types = list(_TYPES)
+
+    kinds = array("q", (types.index(record["type"]) for record in records))
+    M = array("d", (math.nan if record["M"] is None else record["M"] for record in records))
+    rho = array("d", (math.nan if record["rho"] is None else record["rho"] for record in records))
+    extra = array("q", (record.get("atoms", int(record.get("natural", False))) for record in records))
+    indptr = array("q", [0])
+    references = array("q")
+    fractions = array("d")
+    for record in records:
+        references.extend(record["constituents"])
+        fractions.extend(record["fractions"])
+        indptr.append(len(references))
+    texts = json.dumps([[record["name"], record["symbol"]] for record in records]).encode("utf-8")
+
+    arrays = (kinds, M, rho, extra, indptr, references, fractions, array("q", roots))
+    if sys.byteorder == "big":
+        for column in arrays:
+            column.byteswap()
+    return b"".join((
+        _HEADER.pack(_MAGIC, FORMAT_VERSION, len(records), len(references), len(roots)),
+        *(column.tobytes() for column in arrays),
+        texts,
+    ))
+
+def from_binary(data: bytes) -> list[Substance]:
+    """Returns substances of a binary serialization (see `to_binary()`).
+
+    Raises:
+        ValueError: If data is not a serialization of a supported version.
+        KeyError: If a referenced isotope or natural element is not in the
+        library.
+    """
+
+    try:
+        magic, version, count, n_references, n_roots = _HEADER.unpack_from(data, 0)
+    except struct.error:
+        magic = None
+    if magic != _MAGIC:
+        raise ValueError("Data is not a serialization of substances.")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Serialization version {version} is not supported.")
+
+    offset = _HEADER.size
+    columns = []
+    for typecode, length in (("q", count), ("d", count), ("d", count), ("q", count), ("q", count + 1),
+                             ("q", n_references), ("d", n_references), ("q", n_roots)):
+        column = array(typecode)
+        column.frombytes(data[offset:offset + 8*length])
+        if sys.byteorder == "big":
+            column.byteswap()
+        columns.append(column)
+        offset += 8*length
+    kinds, M, rho, extra, indptr, references, fractions, roots = columns
+    texts = json.loads(bytes(data[offset:]).decode("utf-8"))
+
+    types = list(_TYPES)
+
+    def records():
+        for k in range(count):
+            record = {
+                "type": types[kinds[k]],
+                "name": texts[k][0],
+                "symbol": texts[k][1],
+                "M": None if math.isnan(M[k]) else M[k],
+                "rho": None if math.isnan(rho[k]) else rho[k],
+                "constituents": references[indptr[k]:indptr[k + 1]],
+                "fractions": fractions[indptr[k]:indptr[k + 1]],
+            }
+            if record["type"] == "Element":
+                record["natural"] = bool(extra[k])
+            elif record["type"] == "Molecule":
+                record["atoms"] = extra[k]
+            yield record
+
+    return _build(records(), roots)
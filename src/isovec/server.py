@@ -0,0 +1,224 @@
+"""Class for EvaluationServer and functions for querying it.
+
+The EvaluationServer class is a local daemon, that listens on a Unix domain
+socket and answers queries for compositions of the materials of a library (see
+`MaterialDefinitions`). The library and all caches of the built substances stay
+in memory. Requests of all connections are evaluated by a single thread in
+batches, where equal requests are evaluated only once.
+
+Protocol: one JSON object per line in both directions. A request contains a
+"method" and an optional "id", that is returned with the response:
+
+    {"id": 1, "method": "get_isotopes", "material": "steel316", "mode": "weight", "use_natural": false}
+    {"id": 1, "result": {"ZAI": [240500, ...], "fraction": [0.0074, ...]}}
+
+Methods are "get_isotopes", "get_elements", "number_densities" (optional
+"rho"), "materials" and "ping". Errors of a request (including a response,
+that is not ready within the timeout) are returned as {"id": ..., "error": ...}.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+from typing import Any
+
+from .definitions import MaterialDefinitions
+from .densities import number_densities
+
+
+class EvaluationServer:
+    """Local server for compositions of a material library with warm caches."""
+
+    def __init__(
+            self, address: str | os.PathLike, definitions: MaterialDefinitions, batch_size: int = 256,
+            timeout: float = 60.0
+        ) -> None:
+        """Constructor of evaluation server. The socket is bound immediately.
+
+        Args:
+            address:
+                Path of the Unix domain socket.
+            definitions:
+                Material library to serve.
+            batch_size:
+                Maximum number of requests evaluated in one batch.
+            timeout:
+                Time [s] a connection waits for the response of a request.
+
+        Raises:
+            OSError: If Unix domain sockets are not supported or the socket
+            could not be bound.
+        """
+
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not supported on this platform.")
+
+        self._address = os.fspath(address)
+        self._definitions = definitions
+        self._batch_size = batch_size
+        self._timeout = timeout
+        self._queue: queue.SimpleQueue[tuple[dict, Future] | None] = queue.SimpleQueue()
+        self._worker = threading.Thread(target=self._evaluate_batches, name="isovec-evaluation", daemon=True)
+
+        self._server = socketserver.ThreadingUnixStreamServer(self._address, _RequestHandler)
+        self._server.daemon_threads = True
+        self._server.evaluation_server = self
+
+
+    # ########
+    # Serving
+    # ########
+
+    def serve_forever(self) -> None:
+        """Serves requests until `shutdown()` is called."""
+        self._worker.start()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._queue.put(None)
+            self._server.server_close()
+            try:
+                os.unlink(self._address)
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self) -> None:
+        """Stops `serve_forever()` (from another thread)."""
+        self._server.shutdown()
+
+    def submit(self, request: dict[str, Any]) -> Future:
+        """Queues a request for evaluation and returns a future of the response."""
+        future = Future()
+        self._queue.put((request, future))
+        return future
+
+
+    # ########
+    # Evaluation
+    # ########
+
+    def _evaluate_batches(self) -> None:
+        """Evaluates queued requests in batches, until None is queued."""
+
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self._batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            results: dict[str, dict] = {}  # {request without id: response without id}
+            for request, future in batch:
+                try:
+                    key = json.dumps({k: v for k, v in request.items() if k != "id"}, sort_keys=True)
+                    if key not in results:
+                        results[key] = self._evaluate(request)
+                    response = dict(results[key])
+                except Exception as ex:  # e.g. malformed library entries, keep the thread alive for all other requests
+                    response = {"error": f"{ex.__class__.__name__}: {ex}"}
+                if "id" in request:
+                    response["id"] = request["id"]
+                future.set_result(response)
+
+            if stop:
+                return
+
+    def _evaluate(self, request: dict[str, Any]) -> dict[str, Any]:
+        """Returns the response of a request (without id)."""
+
+        try:
+            method = request.get("method")
+            if method == "ping":
+                return {"result": "pong"}
+            if method == "materials":
+                return {"result": list(self._definitions)}
+
+            substance = self._definitions.get(request["material"])
+            mode = request.get("mode", "atomic")
+            use_natural = bool(request.get("use_natural", False))
+            if method == "get_isotopes":
+                isotopes = sorted(substance.get_isotopes(mode, use_natural).items(), key=lambda item: item[0].ZAI)
+                return {"result": {"ZAI": [isotope.ZAI for isotope, _ in isotopes], "fraction": [f for _, f in isotopes]}}
+            if method == "get_elements":
+                elements = substance.get_elements(mode)
+                return {"result": {"element": [element.name for element in elements], "fraction": list(elements.values())}}
+            if method == "number_densities":
+                zai, values = number_densities(substance, request.get("rho"), use_natural)
+                return {"result": {"ZAI": list(zai), "number_density": list(values)}}
+            return {"error": f"Unknown method \"{method}\"."}
+        except KeyError as ex:
+            return {"error": str(ex.args[0]) if ex.args else "Missing key."}
+        except (ValueError, TypeError) as ex:
+            return {"error": str(ex)}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads requests line by line and writes the responses of the evaluation server."""
+
+    def handle(self) -> None:
+        evaluation_server: EvaluationServer = self.server.evaluation_server
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("Request must be a JSON object.")
+            except ValueError as ex:
+                response = {"error": f"Invalid request: {ex}"}
+            else:
+                try:
+                    response = evaluation_server.submit(request).result(evaluation_server._timeout)
+                except FutureTimeoutError:
+                    response = {"error": "Evaluation timed out."}
+                    if "id" in request:
+                        response["id"] = request["id"]
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+def serve(address: str | os.PathLike, library: str | os.PathLike) -> None:
+    """Serves a library file (see `MaterialDefinitions.from_file()`) on a Unix domain socket until interrupted."""
+    server = EvaluationServer(address, MaterialDefinitions.from_file(library))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+def query(address: str | os.PathLike, requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Sends requests to an evaluation server and returns the responses.
+
+    Args:
+        address:
+            Path of the Unix domain socket.
+        requests:
+            Requests (see module description).
+
+    Returns:
+        Responses in the order of the requests.
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(os.fspath(address))
+        with connection.makefile("rwb") as stream:
+            responses = []
+            for request in requests:
+                stream.write(json.dumps(request).encode("utf-8") + b"\n")
+                stream.flush()
+                responses.append(json.loads(stream.readline()))
+    return responses
@@ -0,0 +1,136 @@
+"""Class for MaterialMatrix.
+
+The MaterialMatrix class evaluates a collection of substances into one sparse
+matrix from materials to isotopes, with a column index of ZAI notations shared
+by all materials. The matrix is stored in compressed sparse row (CSR) format
+with arrays of the standard library, that can be handed over to NumPy or SciPy.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import Any, Literal
+
+from .substance import Substance
+
+
+class MaterialMatrix:
+    """Sparse matrix from materials to isotopes.
+
+    Rows are materials, in the order given, columns are isotopes, ordered by
+    their ZAI notation. Values are atomic or weight fractions, so that each row
+    sums up to unity.
+    """
+
+    def __init__(
+            self, substances: Iterable[Substance], mode: Literal["atomic", "weight"] = "atomic",
+            use_natural: bool | Iterable = False, columns: Sequence[int] = None
+        ) -> None:
+        """Constructor of material matrix.
+
+        Args:
+            substances:
+                Substances, that form the rows of the matrix.
+            mode:
+                Wether 'atomic' or 'weight' fractions are to be fetched.
+            use_natural:
+                Flag to use fraction of element, if it is natural.
+                Alternatively, a collection of elements can be supplied, that
+                shall be considered.
+            columns:
+                ZAI notations of the columns, e.g. of another matrix. Defaults
+                to all isotopes of the substances.
+
+        Raises:
+            ValueError: If mode is not supported.
+            KeyError: If given columns miss an isotope of a substance.
+        """
+
+        if mode in {"atomic", "at", "mole", "mol"}:
+            by_weight = False
+        elif mode in {"weight", "wt"}:
+            by_weight = True
+        else:
+            raise ValueError(f"Mode \"{mode}\" not supported for gathering isotopes.")
+        natural_keys = Substance._natural_keys(use_natural)
+
+        substances = list(substances)
+        raws = [substance._raw_isotopes(by_weight, natural_keys) for substance in substances]
+
+        if columns is None:
+            columns = sorted({isotope.ZAI for raw in raws for isotope in raw})
+        self._rows: tuple[str, ...] = tuple(substance.name for substance in substances)
+        self._columns = array("q", columns)
+        column_of = {zai: j for j, zai in enumerate(self._columns)}
+
+        self._indptr = array("q", [0])
+        self._indices = array("q")
+        self._data = array("d")
+        for substance, raw in zip(substances, raws):
+            norm_tmp = sum(raw.values())
+            try:
+                entries = sorted((column_of[isotope.ZAI], f_i/norm_tmp) for isotope, f_i in raw.items())
+            except KeyError as ex:
+                raise KeyError(f"Isotope with ZAI {ex.args[0]} of {substance.__class__.__name__} \"{substance.name}\" is not in the columns.") from None
+            self._indices.extend(j for j, _ in entries)
+            self._data.extend(f_j for _, f_j in entries)
+            self._indptr.append(len(self._indices))
+
+
+    # ########
+    # Properties
+    # ########
+
+    @property
+    def rows(self):
+        """Names of the materials of the rows."""
+        return self._rows
+
+    @property
+    def columns(self):
+        """ZAI notations of the columns."""
+        return self._columns
+
+    @property
+    def shape(self):
+        """Number of rows and columns."""
+        return (len(self._rows), len(self._columns))
+
+
+    # ########
+    # Matrix
+    # ########
+
+    def matrix(self) -> tuple[array, array, array]:
+        """Returns the matrix in CSR format.
+
+        Returns:
+            Tuple of index pointer, column indices and data arrays.
+        """
+        return self._indptr, self._indices, self._data
+
+    def as_numpy(self) -> tuple[Any, Any, Any]:
+        """Returns index pointer, column indices and data as NumPy arrays (zero-copy views).
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        try:
+            import numpy as np
+        except ImportError as ex:
+            raise ImportError("NumPy is required for NumPy views of the material matrix.") from ex
+        return tuple(np.frombuffer(column, dtype=np.dtype(column.typecode)) for column in self.matrix())
+
+    def as_scipy(self) -> Any:
+        """Returns the matrix as SciPy CSR matrix.
+
+        Raises:
+            ImportError: If SciPy is not installed.
+        """
+        try:
+            from scipy.sparse import csr_matrix
+        except ImportError as ex:
+            raise ImportError("SciPy is required for sparse matrices.") from ex
+        indptr, indices, data = self.as_numpy()
+        return csr_matrix((data, indices, indptr), shape=self.shape)
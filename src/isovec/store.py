@@ -0,0 +1,275 @@
+"""Class for VectorStore and functions for writing stores.
+
+A vector store is a file of evaluated isotopic compositions (ZAI notations and
+fractions) of many materials. It is written once in a single pass and opened
+with `mmap`, so that the compositions of single materials are accessed
+randomly as zero-copy views, without loading the whole file.
+
+Layout of the file (native byte order, all numbers 8 bytes):
+    header: magic, flags (weight fractions, big endian), number of materials,
+        offset of the index
+    per material: ZAI notations (int64), followed by fractions (float64)
+    index: offsets and lengths of the materials (int64), offsets of the names
+        (int64) and the names (UTF-8)
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Literal
+
+from .substance import Substance
+
+
+_MAGIC = b"ISOVEC\x00\x01"
+_HEADER = struct.Struct("=8sqqq")  # magic, flags, number of materials, offset of index
+
+_FLAG_WEIGHT = 1
+_FLAG_BIG_ENDIAN = 2
+
+
+def write_store(
+        path: str | os.PathLike, substances: Iterable[Substance], mode: Literal["atomic", "weight"] = "atomic",
+        use_natural: bool | Iterable = False
+    ) -> int:
+    """Writes the isotopic compositions of substances to a vector store.
+
+    Substances are evaluated and written one at a time, only the index is kept
+    in memory. Compositions are stored by the name of the substance.
+
+    Args:
+        path:
+            Path of the file.
+        substances:
+            Substances to write.
+        mode:
+            Wether 'atomic' or 'weight' fractions are to be stored.
+        use_natural:
+            Flag to use fraction of element, if it is natural.
+            Alternatively, a collection of elements can be supplied, that
+            shall be considered.
+
+    Returns:
+        Number of written materials.
+
+    Raises:
+        ValueError: If mode is not supported or names are not unique.
+    """
+
+    if mode in {"atomic", "at", "mole", "mol"}:
+        by_weight = False
+    elif mode in {"weight", "wt"}:
+        by_weight = True
+    else:
+        raise ValueError(f"Mode \"{mode}\" not supported for vector stores.")
+    natural_keys = Substance._natural_keys(use_natural)
+
+    def vectors():
+        for substance in substances:
+            raw_isotopes = substance._raw_isotopes(by_weight, natural_keys)
+            norm_tmp = sum(raw_isotopes.values())
+            isotopes = sorted(raw_isotopes, key=lambda isotope: isotope.ZAI)
+            yield substance.name, [isotope.ZAI for isotope in isotopes], [raw_isotopes[isotope]/norm_tmp for isotope in isotopes]
+
+    return write_store_vectors(path, vectors(), by_weight)
+
+def write_store_vectors(
+        path: str | os.PathLike, vectors: Iterable[tuple[str, Iterable[int], Iterable[float]]],
+        by_weight: bool = False
+    ) -> int:
+    """Writes evaluated isotopic compositions to a vector store (see `write_store()`).
+
+    Args:
+        path:
+            Path of the file.
+        vectors:
+            Name, ZAI notations (ascending) and fractions of each material.
+        by_weight:
+            Flag, that fractions are weight fractions.
+
+    Returns:
+        Number of written materials.
+
+    Raises:
+        ValueError: If names are not unique.
+    """
+
+    flags = (_FLAG_WEIGHT if by_weight else 0) | (_FLAG_BIG_ENDIAN if sys.byteorder == "big" else 0)
+
+    offsets = array("q")
+    lengths = array("q")
+    names: list[bytes] = []
+    seen: set[str] = set()
+
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, flags, 0, 0))  # patched after the index is known
+        for name, zai, fractions in vectors:
+            if name in seen:
+                raise ValueError(f"Name \"{name}\" occurs more than once in vector store.")
+            seen.add(name)
+
+            zai = array("q", zai)
+            fractions = array("d", fractions)
+            offsets.append(file.tell())
+            lengths.append(len(zai))
+            names.append(name.encode("utf-8"))
+            zai.tofile(file)
+            fractions.tofile(file)
+
+        index_offset = file.tell()
+        name_offsets = array("q", [0])
+        for name in names:
+            name_offsets.append(name_offsets[-1] + len(name))
+        offsets.tofile(file)
+        lengths.tofile(file)
+        name_offsets.tofile(file)
+        file.write(b"".join(names))
+
+        file.seek(0)
+        file.write(_HEADER.pack(_MAGIC, flags, len(names), index_offset))
+
+    return len(names)
+
+
+class VectorStore:
+    """Read-only, memory-mapped store of isotopic compositions.
+
+    Compositions are looked up by the name of the material and returned as
+    zero-copy views of ZAI notations and fractions. Views must be released,
+    before the store is closed.
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        """Opens a vector store (see `write_store()`).
+
+        Args:
+            path:
+                Path of the file.
+
+        Raises:
+            ValueError: If the file is not a vector store or was written with
+            another byte order.
+        """
+
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        try:
+            magic, flags, count, index_offset = _HEADER.unpack_from(self._mmap, 0)
+        except struct.error:
+            magic = None
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"File \"{path}\" is not a vector store.")
+        if bool(flags & _FLAG_BIG_ENDIAN) != (sys.byteorder == "big"):
+            self.close()
+            raise ValueError(f"Vector store \"{path}\" was written with another byte order.")
+
+        self._by_weight = bool(flags & _FLAG_WEIGHT)
+        index = self._view[index_offset:index_offset + 8*(3*count + 1)].cast("q")
+        self._offsets = index[:count]
+        self._lengths = index[count:2*count]
+        name_offsets = index[2*count:]
+        names = bytes(self._view[index_offset + 8*(3*count + 1):])
+        self._index: dict[str, int] = {
+            names[name_offsets[k]:name_offsets[k + 1]].decode("utf-8"): k for k in range(count)
+        }
+
+
+    # ########
+    # Properties
+    # ########
+
+    @property
+    def mode(self):
+        """Mode of the stored fractions ('atomic' or 'weight')."""
+        return "weight" if self._by_weight else "atomic"
+
+    @property
+    def names(self):
+        """Names of the stored materials."""
+        return list(self._index)
+
+
+    # ########
+    # Lookup
+    # ########
+
+    def get(self, name: str) -> tuple[memoryview, memoryview]:
+        """Returns the composition of a material as zero-copy views.
+
+        Args:
+            name:
+                Name of the material.
+
+        Returns:
+            Tuple of views of the ZAI notations (int64) and fractions
+            (float64), in ascending order of the ZAI notation.
+
+        Raises:
+            KeyError: If no material with this name is stored.
+        """
+
+        try:
+            k = self._index[name]
+        except KeyError:
+            raise KeyError(f"Material \"{name}\" is not in the vector store.") from None
+        offset, length = self._offsets[k], self._lengths[k]
+        return (
+            self._view[offset:offset + 8*length].cast("q"),
+            self._view[offset + 8*length:offset + 16*length].cast("d"),
+        )
+
+    def get_dict(self, name: str) -> dict[int, float]:
+        """Returns the composition of a material as dictionary of ZAI notations and fractions."""
+        zai, fractions = self.get(name)
+        return dict(zip(zai, fractions))
+
+    def as_numpy(self, name: str) -> tuple[Any, Any]:
+        """Returns the composition of a material as NumPy arrays (zero-copy views, read-only).
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            KeyError: If no material with this name is stored.
+        """
+        try:
+            import numpy as np
+        except ImportError as ex:
+            raise ImportError("NumPy is required for NumPy views of the vector store.") from ex
+        zai, fractions = self.get(name)
+        return np.frombuffer(zai, dtype=np.int64), np.frombuffer(fractions, dtype=np.float64)
+
+    def close(self) -> None:
+        """Closes the store. All views of compositions must be released before."""
+        for attribute in ("_offsets", "_lengths"):
+            view = getattr(self, attribute, None)
+            if view is not None:
+                view.release()
+        self._view.release()
+        self._mmap.close()
+
+
+    # ########
+    # Operators
+    # ########
+
+    def __enter__(self) -> VectorStore:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
@@ -0,0 +1,224 @@
+"""Class for CompiledMixture and streaming functions.
+
+The CompiledMixture class precompiles the structure of a mixture to a matrix
+from its constituents (feeds) to isotopes or elements. Compositions for new
+fractions of the feeds are evaluated with this matrix, without creating a new
+mixture or walking the tree of substances. This allows to process streams of
+fraction vectors, e.g. from process data, with constant memory.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Literal
+
+from .isotope import Isotope
+from .substance import Substance
+
+
+class CompiledMixture:
+    """Precompiled matrix from the constituents of a substance to isotopes or elements.
+
+    The constituents of the substance are the feeds. Each feed is represented
+    by a sparse column of its isotopic (or elemental) composition, that
+    already includes the conversion from the input fractions of the feeds to
+    the fraction mode of the output. The columns of the output are ordered
+    like the results of `get_isotopes()` or `get_elements()`.
+
+    Any substance can be compiled. Isotopes as feeds (of an `Element`) are
+    their own isotopic composition and belong to the compiled element; they
+    are never replaced by the surrogate of a natural element, as changed
+    fractions no longer match the natural composition. Fractions of isotopes
+    cannot be given in 'volume' mode.
+    """
+
+    def __init__(
+            self, substance: Substance, input_mode: Literal["atomic", "weight", "volume"] = "atomic",
+            mode: Literal["atomic", "weight"] = "atomic", use_natural: bool | Iterable = False,
+            elements: bool = False
+        ) -> None:
+        """Constructor of compiled mixture.
+
+        Args:
+            substance:
+                Substance, whose constituents are the feeds.
+            input_mode:
+                Wether fractions of the feeds are given as 'atomic', 'weight'
+                or 'volume' fractions.
+            mode:
+                Wether 'atomic' or 'weight' fractions are to be fetched.
+            use_natural:
+                Flag to use fraction of element, if it is natural.
+                Alternatively, a collection of elements can be supplied, that
+                shall be considered.
+            elements:
+                Flag to fetch elements instead of isotopes.
+
+        Raises:
+            ValueError: If modes are not supported or conversion is not
+            possible (e.g. volume fractions of isotopes).
+        """
+
+        if mode in {"atomic", "at", "mole", "mol"}:
+            by_weight = False
+        elif mode in {"weight", "wt"}:
+            by_weight = True
+        else:
+            raise ValueError(f"Mode \"{mode}\" not supported for gathering {'elements' if elements else 'isotopes'}.")
+
+        self._feeds: tuple[Isotope | Substance, ...] = substance.constituents
+        factors = self._conversion_factors(self._feeds, input_mode, by_weight)
+
+        natural_keys = Substance._natural_keys(use_natural)
+        raws = []
+        for feed in self._feeds:
+            if not isinstance(feed, Substance):  # isotope of an element
+                raws.append({substance: 1.0} if elements else {feed: 1.0})
+            elif elements:
+                raws.append(feed._raw_elements(by_weight))
+            else:
+                raws.append(feed._raw_isotopes(by_weight, natural_keys))
+
+        self._columns: tuple[Isotope | Substance, ...] = tuple(sorted(set().union(*raws)))
+        column_of = {column: j for j, column in enumerate(self._columns)}
+
+        # sparse column of each feed, scaled by its conversion factor
+        self._indices: list[array] = []
+        self._values: list[array] = []
+        for raw, factor in zip(raws, factors):
+            self._indices.append(array("q", (column_of[column] for column in raw.keys())))
+            self._values.append(array("d", (factor*f_j for f_j in raw.values())))
+
+    @staticmethod
+    def _conversion_factors(feeds: Sequence[Isotope | Substance], input_mode: str, by_weight: bool) -> list[float]:
+        """Returns factors to convert input fractions of feeds to (unnormalised) fractions used for gathering."""
+
+        if input_mode in {"atomic", "at", "mole", "mol"}:
+            values = [feed.M for feed in feeds] if by_weight else None
+        elif input_mode in {"weight", "wt"}:
+            values = None if by_weight else [1.0 / feed.M if feed.M else 0.0 for feed in feeds]
+        elif input_mode in {"volume", "vol"}:
+            if not all(isinstance(feed, Substance) for feed in feeds):
+                raise ValueError("Conversion of volume fractions not possible for isotopes as feeds.")
+            values = [feed.rho for feed in feeds] if by_weight else [1.0 / feed.V_m if feed.V_m else 0.0 for feed in feeds]
+        else:
+            raise ValueError(f"Unknown input mode \"{input_mode}\".")
+
+        if values is None:
+            return [1.0 for feed in feeds]
+        if not all(values):
+            raise ValueError(f"Conversion of {input_mode} fractions not possible, one of the feeds lacks molar mass or density.")
+        return values
+
+
+    # ########
+    # Properties
+    # ########
+
+    @property
+    def feeds(self):
+        """Constituents of the compiled substance, that are the inputs."""
+        return self._feeds
+
+    @property
+    def columns(self):
+        """Isotopes (or elements) of the output."""
+        return self._columns
+
+
+    # ########
+    # Evaluation
+    # ########
+
+    def evaluate(self, fractions: Sequence[float]) -> array:
+        """Returns the composition for given fractions of the feeds.
+
+        Args:
+            fractions:
+                Fraction of each feed in the input mode. Values are normalised
+                and don't need to add up to unity.
+
+        Returns:
+            Array of fractions, ordered like `columns`.
+
+        Raises:
+            ValueError: If number of fractions does not match the feeds or all
+            fractions are zero.
+        """
+
+        if len(fractions) != len(self._feeds):
+            raise ValueError(f"Number of fractions ({len(fractions)}) must match the number of feeds ({len(self._feeds)}).")
+
+        summed = [0.0]*len(self._columns)
+        for f_i, indices, values in zip(fractions, self._indices, self._values):
+            f_i = abs(float(f_i))
+            if f_i:
+                for j, v_j in zip(indices, values):
+                    summed[j] += f_i*v_j
+
+        total = sum(summed)
+        if not total:
+            raise ValueError("Fractions of all feeds are zero.")
+        return array("d", (f_j / total for f_j in summed))
+
+    def evaluate_dict(self, fractions: Sequence[float]) -> dict[Isotope | Substance, float]:
+        """Returns the composition for given fractions of the feeds as dictionary (see `evaluate()`).
+
+        Isotopes (or elements) with a fraction of zero are omitted.
+        """
+        return {column: f_j for column, f_j in zip(self._columns, self.evaluate(fractions)) if f_j}
+
+    def stream(self, rows: Iterable[Sequence[float]], as_dict: bool = False) -> Iterator[array | dict]:
+        """Yields the composition for each row of feed fractions.
+
+        Rows are processed one at a time, so that arbitrary long streams (e.g.
+        rows of a CSV reader) are evaluated with constant memory.
+
+        Args:
+            rows:
+                Fractions of the feeds for each record.
+            as_dict:
+                Flag to yield dictionaries instead of arrays.
+
+        Yields:
+            Composition of each record (see `evaluate()`).
+        """
+        evaluate = self.evaluate_dict if as_dict else self.evaluate
+        for row in rows:
+            yield evaluate(row)
+
+
+def stream_compositions(
+        substance: Substance, rows: Iterable[Sequence[float]], input_mode: Literal["atomic", "weight", "volume"] = "atomic",
+        mode: Literal["atomic", "weight"] = "atomic", use_natural: bool | Iterable = False,
+        elements: bool = False, as_dict: bool = False
+    ) -> Iterator[array | dict]:
+    """Yields compositions of a substance for a stream of feed fractions.
+
+    Shorthand for compiling the substance (see `CompiledMixture`) and streaming
+    the rows through it.
+
+    Args:
+        substance:
+            Substance, whose constituents are the feeds.
+        rows:
+            Fractions of the feeds for each record.
+        input_mode:
+            Wether fractions of the feeds are given as 'atomic', 'weight' or
+            'volume' fractions.
+        mode:
+            Wether 'atomic' or 'weight' fractions are to be fetched.
+        use_natural:
+            Flag to use fraction of element, if it is natural. Alternatively, a
+            collection of elements can be supplied, that shall be considered.
+        elements:
+            Flag to fetch elements instead of isotopes.
+        as_dict:
+            Flag to yield dictionaries instead of arrays.
+
+    Yields:
+        Composition of each record.
+    """
+    compiled = CompiledMixture(substance, input_mode, mode, use_natural, elements)
+    yield from compiled.stream(rows, as_dict)
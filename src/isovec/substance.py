@@ -7,11 +7,13 @@ Substance class serves as the (abstract) base class for `Element`, `Molecule` an
 from __future__ import annotations
 
 from collections import defaultdict
-from typing import Any, TypeAlias, Union, Literal, Iterable
+from typing import Any, TypeAlias, Union, Literal, Iterable, Sequence
 from abc import ABCMeta, abstractmethod
+from array import array
 import copy
+import math
 
-from .constants import N_A
+from .constants import N_A, BARN
 from .conversion import at_to_wt, wt_to_at, vol_to_at, at_to_vol
 from .isotope import Isotope
 from .node import Node, char_sets
@@ -29,7 +31,12 @@ class Substance(metaclass=ABCMeta):
     mass implemented. Density can generally not be calculated but instead must
     be stated explicitly. Optionally, a shorter name can be given in the form
     of a symbol.
+
+    The composition is stored compactly as a tuple of constituents and an array
+    of their atomic fractions.
     """
+
+    __slots__ = ("_name", "_constituents", "_fractions", "_M", "_rho", "_symbol", "_cache")
     
     @classmethod
     @abstractmethod
@@ -74,18 +81,8 @@ class Substance(metaclass=ABCMeta):
             not allowed as constituent for substance.
         """
 
-        self._name = name                             # name of the substance
-        self._composition: dict[Constituent, float]   # {constituent: atomic (mole) fraction}
-        self._M: float                                # molar mass [g mol^-1]
-        self._rho: float                              # density [g cm^-3]
-        self._symbol: str                             # symbol of the substance
-
         # ensure input constituents are of allowed classes
-        for constituent in composition.keys():
-            if not self.instance_is_allowed(constituent):
-                type_names = ", ".join(_type.__name__ for _type in self._get_allowed_constituents())
-                raise ValueError(f"Could not create {self.__class__.__name__} object with type {constituent.__class__.__name__} as constituent.\n"
-                                 + f"Valid classes for {self.__class__.__name__} constituents: {type_names}.")
+        self._check_constituents(composition)
 
         # ensure atomic fraction of input composition
         if mode == "_legacy":  # as done before 1.1.0
@@ -104,14 +101,45 @@ class Substance(metaclass=ABCMeta):
         # populate composition dictionary
         x_sum = sum(composition.values())
         if self._NORMALISE:  # normalise fractions
-            self._composition = {constituent: (x_i / x_sum) for constituent, x_i in composition.items() if x_i > 0}
+            composition = {constituent: (x_i / x_sum) for constituent, x_i in composition.items() if x_i > 0}
         else:  # no normalisation
-            self._composition = {constituent: x_i for constituent, x_i in composition.items() if x_i > 0}
+            composition = {constituent: x_i for constituent, x_i in composition.items() if x_i > 0}
+
+        self._setup(name, composition, **kwargs)
+
+    def _setup(self, name: str, composition: dict[Constituent, float], **kwargs) -> None:
+        """Sets all attributes of the substance without any checks.
 
-        # get molar mass and density from kwargs or calculate it
-        self._M = kwargs.get("M", self._calc_M())
-        self._rho = kwargs.get("rho", 0.0)
-        self._symbol = kwargs.get("symbol", "")
+        Shared by the constructor and `from_trusted()`. Subclasses extend this
+        method with their own attributes.
+
+        Args:
+            name:
+                Descriptive name.
+            composition:
+                Dictionary that maps a constituent of the substance to its
+                (final) atomic fraction.
+            **kwargs:
+                Keyword arguments to override values.
+        """
+
+        self._name = name                                     # name of the substance
+        self._constituents = tuple(composition.keys())        # constituents of the substance
+        self._fractions = array("d", composition.values())    # atomic (mole) fraction of each constituent
+        self._M = kwargs.get("M", None)                       # given molar mass [g mol^-1] (None if calculated)
+        self._rho = kwargs.get("rho", None)                   # given density [g cm^-3] (None if calculated)
+        self._symbol = kwargs.get("symbol", "")               # symbol of the substance
+        self._cache: dict[Any, Any] = {}                      # derived quantities, that are calculated once
+
+    @classmethod
+    def _check_constituents(cls, constituents: Iterable[Constituent]) -> None:
+        """Raises ValueError, if a constituent is not of an allowed class."""
+
+        for constituent in constituents:
+            if not cls.instance_is_allowed(constituent):
+                type_names = ", ".join(_type.__name__ for _type in cls._get_allowed_constituents())
+                raise ValueError(f"Could not create {cls.__name__} object with type {constituent.__class__.__name__} as constituent.\n"
+                                 + f"Valid classes for {cls.__name__} constituents: {type_names}.")
     
     @classmethod
     def _inp_composition_atomic(cls, inp_composition: dict[Constituent, float]) -> dict[Constituent, float]:
@@ -240,6 +268,67 @@ class Substance(metaclass=ABCMeta):
         return cls(name, composition, mode="volume", **kwargs)
     
 
+    @classmethod
+    def from_trusted(cls, name: str, composition: dict[Constituent, float], **kwargs) -> Substance:
+        """Constructor for validated atomic (mole) fractions, skipping all checks.
+
+        Intended for bulk loading of libraries, that have been validated
+        before. Constituents are not checked, fractions are neither converted
+        nor normalised and are used as given. Call `validate()` to perform the
+        checks of the ordinary constructor afterwards. Additional attributes
+        of subclasses are passed as keyword arguments, e.g. `natural` for
+        `Element` and `atoms` (required) for `Molecule`.
+
+        Args:
+            name:
+                Descriptive name.
+            composition:
+                Dictionary that maps a constituent of the substance to its
+                normalised atomic fraction.
+            **kwargs:
+                Keyword arguments to override values.
+        
+        Keyword Args:
+            M (float):
+                Set molar mass.
+            rho (float):
+                Set density.
+            symbol (str):
+                Short symbol.
+
+        Returns:
+            Substance instance.
+        """
+        new = cls.__new__(cls)
+        new._setup(name, composition, **kwargs)
+        return new
+
+    def validate(self, recursive: bool = False) -> None:
+        """Checks the substance, as done by the ordinary constructor.
+
+        Constituents need to be of an allowed class and fractions need to be
+        positive and normalised. Counterpart to `from_trusted()`.
+
+        Args:
+            recursive:
+                Also validate all contained substances.
+
+        Raises:
+            ValueError: If substance is not valid.
+        """
+
+        self._check_constituents(self._constituents)
+
+        if not all(x_i > 0 for x_i in self._fractions):
+            raise ValueError(f"Fractions of {self.__class__.__name__} \"{self._name}\" must be positive.")
+        if self._NORMALISE and not math.isclose(sum(self._fractions), 1.0, rel_tol=1e-9):
+            raise ValueError(f"Fractions of {self.__class__.__name__} \"{self._name}\" must be normalised.")
+
+        if recursive:
+            for constituent in self._constituents:
+                if isinstance(constituent, Substance):
+                    constituent.validate(recursive=True)
+
     def copy(self, name: str = None, M: float = None, rho: float = None, symbol: str = None) -> Substance:
         """Copy substance and edit properties.
         
@@ -268,6 +357,8 @@ class Substance(metaclass=ABCMeta):
             new._M = M
         if rho:
             new._rho = rho
+        if M or rho:  # derived quantities need to be recalculated
+            new._cache.clear()
         if symbol:
             new._symbol = symbol
 
@@ -285,18 +376,43 @@ class Substance(metaclass=ABCMeta):
 
     @property
     def composition(self):
-        """Dictionary of constituents and their atomic (mole) fraction."""
-        return self._composition
+        """Dictionary of constituents and their atomic (mole) fraction.
+        
+        The dictionary is created from the internal storage on each access.
+        """
+        return dict(zip(self._constituents, self._fractions))
+
+    @property
+    def constituents(self):
+        """Tuple of constituents."""
+        return self._constituents
+
+    @property
+    def fractions(self):
+        """Read-only view of the atomic (mole) fractions of the constituents."""
+        return memoryview(self._fractions).toreadonly()
 
     @property
     def M(self):
         """Molar mass [g mol^-1]."""
-        return self._M
+        if self._M is not None:
+            return self._M
+        try:
+            return self._cache["M"]
+        except KeyError:
+            self._cache["M"] = self._calc_M()
+            return self._cache["M"]
     
     @property
     def rho(self):
         """Density [g cm^-3]."""
-        return self._rho
+        if self._rho is not None:
+            return self._rho
+        try:
+            return self._cache["rho"]
+        except KeyError:
+            self._cache["rho"] = self._calc_rho()
+            return self._cache["rho"]
 
     @property
     def symbol(self):
@@ -306,12 +422,20 @@ class Substance(metaclass=ABCMeta):
     @property
     def V_m(self):
         """Molar volume [cm^3 mol^-1]."""
-        return self._calc_V_m()
+        try:
+            return self._cache["V_m"]
+        except KeyError:
+            self._cache["V_m"] = self._calc_V_m()
+            return self._cache["V_m"]
     
     @property
     def n(self):
         """Number density [cm^-3]."""
-        return self._calc_n()
+        try:
+            return self._cache["n"]
+        except KeyError:
+            self._cache["n"] = self._calc_n()
+            return self._cache["n"]
 
 
     # ########
@@ -327,11 +451,18 @@ class Substance(metaclass=ABCMeta):
         Will return zero if calculation is not possible.
         """
 
-        if all(constituent.M > 0 for constituent in self._composition.keys()):
-            return sum(x_i*constituent.M for constituent, x_i in self._composition.items())
+        if all(constituent.M > 0 for constituent in self._constituents):
+            return sum(x_i*constituent.M for constituent, x_i in zip(self._constituents, self._fractions))
         else:
             return 0.0
 
+    def _calc_rho(self) -> float:
+        """Calculates density.
+        
+        Density can generally not be calculated, so zero is returned.
+        """
+        return 0.0
+
     def _calc_V_m(self) -> float:
         r"""Calculates molar volume.
 
@@ -340,8 +471,8 @@ class Substance(metaclass=ABCMeta):
         Will return zero if calculation is not possible.
         """
 
-        if self._M != 0 and self._rho != 0:
-            return self._M / self._rho
+        if self.M != 0 and self.rho != 0:
+            return self.M / self.rho
         else:
             return 0.0
         
@@ -354,8 +485,8 @@ class Substance(metaclass=ABCMeta):
         Will return zero if calculation is not possible.
         """
 
-        if self._M != 0 and self._rho != 0:
-            return N_A / self._M * self._rho
+        if self.M != 0 and self.rho != 0:
+            return N_A / self.M * self.rho
         else:
             return 0.0
 
@@ -366,21 +497,31 @@ class Substance(metaclass=ABCMeta):
 
     def get_composition_in_wt(self) -> dict[Constituent, float]:
         """Returns constituents with their weight fractions."""
-        
-        at_fracs = [x_i for x_i in self._composition.values()]
-        molar_masses = [constituent.M for constituent in self._composition.keys()]
+        return dict(zip(self._constituents, self._fractions_in_wt()))
+
+    def _fractions_in_wt(self) -> array:
+        """Returns weight fractions of the constituents (cached).
+
+        The composition of a substance does not change after construction,
+        therefore the conversion is only done once. The returned array is
+        shared and must not be altered.
+        """
 
-        wt_fracs = at_to_wt(at_fracs, molar_masses)
-        return {constituent: w_i for constituent, w_i in zip(self._composition.keys(), wt_fracs)}
+        try:
+            return self._cache["wt"]
+        except KeyError:
+            molar_masses = [constituent.M for constituent in self._constituents]
+
+            self._cache["wt"] = array("d", at_to_wt(self._fractions, molar_masses))
+            return self._cache["wt"]
    
     def get_composition_in_vol(self) -> dict[Constituent, float]:
         """Returns constituents with their volume fractions."""
         
-        at_fracs = [x_i for x_i in self._composition.values()]
-        molar_volumes = [constituent.V_m for constituent in self._composition.keys()]
+        molar_volumes = [constituent.V_m for constituent in self._constituents]
 
-        vol_fracs = at_to_vol(at_fracs, molar_volumes)
-        return {constituent: phi_i for constituent, phi_i in zip(self._composition.keys(), vol_fracs)}
+        vol_fracs = at_to_vol(self._fractions, molar_volumes)
+        return {constituent: phi_i for constituent, phi_i in zip(self._constituents, vol_fracs)}
         
 
     # ########
@@ -418,11 +559,11 @@ class Substance(metaclass=ABCMeta):
         element_list[-1] = element_list[-1] + 1  # increase counter
 
         if not by_weight:
-            composition = self._composition
+            fractions = self._fractions
         else:
-            composition = self.get_composition_in_wt()  
+            fractions = self._fractions_in_wt()
         
-        for constituent, f_i in composition.items():
+        for constituent, f_i in zip(self._constituents, fractions):
             constituent._append_elements(element_list, by_weight, f_p*f_i)
 
         return element_list
@@ -462,23 +603,22 @@ class Substance(metaclass=ABCMeta):
         """
 
         if mode in {"atomic", "at", "mole", "mol"}:
-            gathered_elements = self._elemental_composition(by_weight=False)
+            raw_elements = self._raw_elements(by_weight=False)
         elif mode in {"weight", "wt"}:
-            gathered_elements = self._elemental_composition(by_weight=True)
+            raw_elements = self._raw_elements(by_weight=True)
         else:
             raise ValueError(f"Mode \"{mode}\" not supported for gathering elements.")
         
-        elements = defaultdict(list)
-        for element, fraction in gathered_elements.values():
-            elements[element].append(fraction)
+        norm_tmp = sum(raw_elements.values())
 
-        return {element: sum(fracs) for element, fracs in sorted(elements.items())}
+        return {element: fraction/norm_tmp for element, fraction in sorted(raw_elements.items())}
     
-    def _isotopic_composition(
-            self, by_weight: bool = False,
-            use_natural: bool | Iterable = False
-        ) -> dict[int, tuple[Isotope, float]]:
+    def _isotopic_composition(self, by_weight: bool = False) -> dict[int, tuple[Isotope, float]]:
         """Collects all contained isotopes with their normalised fraction.
+
+        Keeps the position of each isotope in the tree (see `make_node()`).
+        Natural elements are always expanded; `get_isotopes()` gathers
+        surrogates of natural elements via `_raw_isotopes()`.
         
         Args:
             by_weight:
@@ -491,35 +631,40 @@ class Substance(metaclass=ABCMeta):
         elemental_composition = self._elemental_composition(by_weight)
         isotopic_composition = {}
 
-        def append_isotopes(id: int, element: Substance, fraction: float):
+        for id_, (element, fraction) in elemental_composition.items():
             if not by_weight:
-                composition = element._composition
-            else:
-                composition = element.get_composition_in_wt()
-            for j, (isotope, iso_fraction) in enumerate(composition.items(), start=1):
-                isotopic_composition[id+j] = (isotope, fraction*iso_fraction)
-
-        def append_surrogate(id: int, element: Substance, fraction: float):
-            surrogate = element.surrogate_isotope()
-            if surrogate:
-                isotopic_composition[id] = (surrogate, fraction)
+                iso_fractions = element._fractions
             else:
-                append_isotopes(id, element, fraction)
-
-        for id, (element, fraction) in elemental_composition.items():
-            if use_natural:
-                if isinstance(use_natural, Iterable):  # have to check if considered
-                    if element in use_natural:
-                        append_surrogate(id, element, fraction)
-                    else:
-                        append_isotopes(id, element, fraction)
-                else:  # must be boolean true, use elemental composition
-                    append_surrogate(id, element, fraction)
-            else:
-                append_isotopes(id, element, fraction)
+                iso_fractions = element._fractions_in_wt()
+            for j, (isotope, iso_fraction) in enumerate(zip(element._constituents, iso_fractions), start=1):
+                isotopic_composition[id_+j] = (isotope, fraction*iso_fraction)
 
         return isotopic_composition
     
+    @staticmethod
+    def _natural_keys(use_natural: bool | Iterable) -> bool | frozenset:
+        """Normalises the `use_natural` argument of isotope gathering.
+
+        Args:
+            use_natural:
+                Flag or collection of elements, as passed to `get_isotopes()`.
+
+        Returns:
+            Boolean flag, if no collection was given, or a set of keys of the
+            given elements, that is matched against `_natural_key()`.
+        """
+
+        if isinstance(use_natural, Iterable):
+            return frozenset(
+                item._natural_key() for item in use_natural if isinstance(item, Substance)
+            ) - {None}
+        else:
+            return bool(use_natural)
+
+    def _natural_key(self) -> tuple | None:
+        """Returns key to match substance in `use_natural` collections (None if not applicable)."""
+        return None
+
     def get_isotopes(
             self, mode: Literal["atomic", "weight"] = "atomic", 
             use_natural: bool | Iterable = False
@@ -539,17 +684,175 @@ class Substance(metaclass=ABCMeta):
         """
         
         if mode in {"atomic", "at", "mole", "mol"}:
-            gathered_isotopes = self._isotopic_composition(by_weight=False, use_natural=use_natural)
+            raw_isotopes = self._raw_isotopes(by_weight=False, natural_keys=self._natural_keys(use_natural))
+        elif mode in {"weight", "wt"}:
+            raw_isotopes = self._raw_isotopes(by_weight=True, natural_keys=self._natural_keys(use_natural))
+        else:
+            raise ValueError(f"Mode \"{mode}\" not supported for gathering isotopes.")
+
+        norm_tmp = sum(raw_isotopes.values())
+
+        return {isotope: fraction/norm_tmp for isotope, fraction in sorted(raw_isotopes.items())}
+
+    def get_contributions(
+            self, mode: Literal["atomic", "weight"] = "atomic",
+            use_natural: bool | Iterable = False
+        ) -> dict[Constituent, dict[Isotope, float]]:
+        """Returns dict of all constituents with the isotopes they contribute.
+
+        Fractions refer to the whole substance, so that summing the
+        contributions of all constituents per isotope gives `get_isotopes()`.
+
+        Args:
+            mode:
+                Wether 'atomic' or 'weight' fractions are to be fetched.
+            use_natural:
+                Flag to use fraction of element, if it is natural.
+                Alternatively, a collection of elements can be supplied, that
+                shall be considered.
+
+        Returns:
+            Dictionary that maps constituents to a dictionary of their
+            isotopes with their fraction in the substance.
+        """
+
+        if mode in {"atomic", "at", "mole", "mol"}:
+            by_weight = False
         elif mode in {"weight", "wt"}:
-            gathered_isotopes = self._isotopic_composition(by_weight=True, use_natural=use_natural)
+            by_weight = True
         else:
             raise ValueError(f"Mode \"{mode}\" not supported for gathering isotopes.")
+        natural_keys = self._natural_keys(use_natural)
+
+        raw_self = self._raw_isotopes(by_weight, natural_keys)
+        norm_tmp = sum(raw_self.values())
+
+        contributions = {}
+        for constituent, f_i in zip(self._constituents, self._gathering_fractions(by_weight)):
+            if isinstance(constituent, Substance):
+                raw_isotopes = constituent._raw_isotopes(by_weight, natural_keys)
+            elif constituent in raw_self:  # isotope of element
+                raw_isotopes = {constituent: 1.0}
+            else:  # isotope of element, that is represented by its surrogate isotope
+                raw_isotopes = raw_self
+            contributions[constituent] = {
+                isotope: f_i*fraction/norm_tmp for isotope, fraction in sorted(raw_isotopes.items())
+            }
+
+        return contributions
+
+    def get_contribution_matrix(
+            self, mode: Literal["atomic", "weight"] = "atomic",
+            use_natural: bool | Iterable = False
+        ) -> tuple[tuple[Constituent, ...], tuple[Isotope, ...], list[array]]:
+        """Returns contributions of all constituents as dense matrix (see `get_contributions()`).
 
-        isotopes = defaultdict(list)
-        for isotope, fraction in gathered_isotopes.values():
-            isotopes[isotope].append(fraction)
+        Returns:
+            Tuple of constituents (rows), isotopes (columns, ordered like
+            `get_isotopes()`) and one array of fractions per row.
+        """
+
+        contributions = self.get_contributions(mode, use_natural)
+        isotopes = tuple(sorted(set().union(*contributions.values())))
+        column_of = {isotope: j for j, isotope in enumerate(isotopes)}
+
+        rows = []
+        for isotope_fractions in contributions.values():
+            row = array("d", bytes(8*len(isotopes)))
+            for isotope, fraction in isotope_fractions.items():
+                row[column_of[isotope]] = fraction
+            rows.append(row)
+
+        return tuple(contributions), isotopes, rows
+
+    def _gathering_fractions(self, by_weight: bool = False) -> Sequence[float]:
+        """Returns fractions of constituents, that are used for gathering elements and isotopes."""
+        if not by_weight:
+            return self._fractions
+        else:
+            return self._fractions_in_wt()
+
+    def _raw_elements(self, by_weight: bool = False) -> dict[Substance, float]:
+        """Returns unnormalised elemental composition per unit of substance (cached).
+
+        Equal to gathering all elements, but summed per element and calculated
+        from the cached compositions of the constituents instead of walking the
+        whole tree. Shared constituents are therefore evaluated only once. In
+        atomic mode, fractions sum up to the number of atoms per particle, in
+        weight mode to one.
+
+        Args:
+            by_weight:
+                Flag to fetch weight fractions of constituents.
+
+        Returns:
+            Dictionary that maps elements to their unnormalised fraction. It
+            is shared and must not be altered.
+        """
+
+        key = ("elements", by_weight)
+        try:
+            return self._cache[key]
+        except KeyError:
+            raw = defaultdict(float)
+            for constituent, f_i in zip(self._constituents, self._gathering_fractions(by_weight)):
+                for element, f_j in constituent._raw_elements(by_weight).items():
+                    raw[element] += f_i*f_j
+            self._cache[key] = dict(raw)
+            return self._cache[key]
+
+    def _raw_isotopes(self, by_weight: bool = False, natural_keys: bool | frozenset = False) -> dict[Isotope, float]:
+        """Returns unnormalised isotopic composition per unit of substance (cached).
+
+        Counterpart of `_raw_elements()` for isotopes.
+
+        Args:
+            by_weight:
+                Flag to fetch weight fractions of constituents.
+            natural_keys:
+                Normalised `use_natural` argument (see `_natural_keys()`).
+
+        Returns:
+            Dictionary that maps isotopes to their unnormalised fraction. It
+            is shared and must not be altered.
+        """
+
+        key = ("isotopes", by_weight, natural_keys)
+        try:
+            return self._cache[key]
+        except KeyError:
+            raw = defaultdict(float)
+            for constituent, f_i in zip(self._constituents, self._gathering_fractions(by_weight)):
+                for isotope, f_j in constituent._raw_isotopes(by_weight, natural_keys).items():
+                    raw[isotope] += f_i*f_j
+            self._cache[key] = dict(raw)
+            return self._cache[key]
+
+    def _number_density_coefficients(self, natural_keys: bool | frozenset = False) -> tuple[array, array]:
+        """Returns isotopes and their number densities per unit density (cached).
+
+        Args:
+            natural_keys:
+                Normalised `use_natural` argument (see `_natural_keys()`).
+
+        Returns:
+            Tuple of arrays with ZAI notations and number densities
+            [barn^-1 cm^-1 / (g cm^-3)], in ascending order of the ZAI
+            notation. They are shared and must not be altered.
+        """
 
-        return {isotope: sum(fracs) for isotope, fracs in sorted(isotopes.items())}
+        key = ("number_densities", natural_keys)
+        try:
+            return self._cache[key]
+        except KeyError:
+            raw_isotopes = self._raw_isotopes(by_weight=True, natural_keys=natural_keys)
+            norm_tmp = sum(raw_isotopes.values())
+            isotopes = sorted(raw_isotopes, key=lambda isotope: isotope.ZAI)
+            self._cache[key] = (
+                array("q", (isotope.ZAI for isotope in isotopes)),
+                array("d", (N_A*BARN * raw_isotopes[isotope]/norm_tmp / isotope.M for isotope in isotopes)),
+            )
+            return self._cache[key]
 
         
     # ########
@@ -593,11 +896,11 @@ class Substance(metaclass=ABCMeta):
 
             nonlocal node_i
             substance: Substance = parent_node.content
-            constituents = list(substance.composition.keys())
+            constituents = substance._constituents
 
             # decide for fraction to be used
             if atomic:
-                at_fracs = list(substance._composition.values())
+                at_fracs = substance._fractions
             if weight:
                 try:
                     wt_fracs = list(substance.get_composition_in_wt().values())
@@ -643,7 +946,7 @@ class Substance(metaclass=ABCMeta):
 
             nonlocal node_i
             substance: Substance = parent_node.content
-            constituents = list(substance.composition.keys())
+            constituents = substance._constituents
 
             for i, constituent in enumerate(constituents):
 
@@ -681,10 +984,10 @@ class Substance(metaclass=ABCMeta):
 
         # create data dictionary
         root_data = {}
-        if self._M:
-            root_data["M"] = self._M
-        if self._rho:
-            root_data["rho"] = self._rho
+        if self.M:
+            root_data["M"] = self.M
+        if self.rho:
+            root_data["rho"] = self.rho
 
         # create root node and start recursive hierarchy construction
         node_i = 0
@@ -0,0 +1,191 @@
+"""Class for IsotopeTable.
+
+The IsotopeTable class evaluates a collection of substances into a long-format
+columnar table with one row per material and isotope (structure of arrays). The
+columns are contiguous arrays of the standard library, that can be handed over
+to NumPy, PyArrow or pandas without copying the data.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+from typing import Any
+
+from .substance import Substance
+from .constants import N_A, BARN
+
+
+class IsotopeTable:
+    """Long-format table of the isotopic compositions of substances.
+
+    Rows are ordered by material (in the order given) and by ZAI notation
+    within each material. Columns are the index of the material `material`,
+    `ZAI`, atomic number `Z`, mass number `A`, isomeric state `I`, atomic
+    fraction `atomic`, weight fraction `weight` and number density
+    `number_density` [barn^-1 cm^-1] (zero if the material has no density).
+    Names of the materials are stored in `names`.
+    """
+
+    def __init__(self, substances: Iterable[Substance], use_natural: bool | Iterable = False) -> None:
+        """Constructor of isotope table.
+
+        Args:
+            substances:
+                Substances to evaluate.
+            use_natural:
+                Flag to use fraction of element, if it is natural.
+                Alternatively, a collection of elements can be supplied, that
+                shall be considered.
+        """
+
+        natural_keys = Substance._natural_keys(use_natural)
+
+        self._names: list[str] = []
+        self._material = array("q")
+        self._ZAI = array("q")
+        self._Z = array("i")
+        self._A = array("i")
+        self._I = array("i")
+        self._atomic = array("d")
+        self._weight = array("d")
+        self._number_density = array("d")
+
+        for k, substance in enumerate(substances):
+            raw_at = substance._raw_isotopes(False, natural_keys)
+            raw_wt = substance._raw_isotopes(True, natural_keys)
+            norm_at = sum(raw_at.values())
+            norm_wt = sum(raw_wt.values())
+            factor = (substance.rho or 0.0) * N_A*BARN / norm_wt
+            isotopes = sorted(raw_at, key=lambda isotope: isotope.ZAI)
+
+            self._names.append(substance.name)
+            self._material.extend(k for _ in isotopes)
+            self._ZAI.extend(isotope.ZAI for isotope in isotopes)
+            self._Z.extend(isotope.Z for isotope in isotopes)
+            self._A.extend(isotope.A for isotope in isotopes)
+            self._I.extend(isotope.I for isotope in isotopes)
+            self._atomic.extend(raw_at[isotope]/norm_at for isotope in isotopes)
+            self._weight.extend(raw_wt[isotope]/norm_wt for isotope in isotopes)
+            self._number_density.extend(factor*raw_wt[isotope]/isotope.M for isotope in isotopes)
+
+
+    # ########
+    # Properties
+    # ########
+
+    @property
+    def names(self):
+        """Names of the materials."""
+        return self._names
+
+    @property
+    def material(self):
+        """Index of the material of each row."""
+        return self._material
+
+    @property
+    def ZAI(self):
+        """ZAI notations."""
+        return self._ZAI
+
+    @property
+    def Z(self):
+        """Atomic numbers."""
+        return self._Z
+
+    @property
+    def A(self):
+        """Mass numbers."""
+        return self._A
+
+    @property
+    def I(self):
+        """Isomeric states."""
+        return self._I
+
+    @property
+    def atomic(self):
+        """Atomic fractions."""
+        return self._atomic
+
+    @property
+    def weight(self):
+        """Weight fractions."""
+        return self._weight
+
+    @property
+    def number_density(self):
+        """Number densities [barn^-1 cm^-1]."""
+        return self._number_density
+
+
+    # ########
+    # Export
+    # ########
+
+    def columns(self) -> dict[str, array]:
+        """Returns dictionary of column names and arrays."""
+        return {
+            "material": self._material, "ZAI": self._ZAI, "Z": self._Z, "A": self._A, "I": self._I,
+            "atomic": self._atomic, "weight": self._weight, "number_density": self._number_density,
+        }
+
+    def as_numpy(self) -> dict[str, Any]:
+        """Returns dictionary of column names and NumPy arrays (zero-copy views).
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        try:
+            import numpy as np
+        except ImportError as ex:
+            raise ImportError("NumPy is required for NumPy views of the isotope table.") from ex
+        return {name: np.frombuffer(column, dtype=np.dtype(column.typecode)) for name, column in self.columns().items()}
+
+    def as_arrow(self) -> Any:
+        """Returns the table as PyArrow table (zero-copy for numerical columns).
+
+        Names of the materials are added as dictionary encoded column "name".
+
+        Raises:
+            ImportError: If PyArrow is not installed.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as ex:
+            raise ImportError("PyArrow is required for Arrow tables.") from ex
+
+        types = {"q": pa.int64(), "i": pa.int32(), "d": pa.float64()}
+        arrays = {
+            name: pa.Array.from_buffers(types[column.typecode], len(column), [None, pa.py_buffer(column)])
+            for name, column in self.columns().items()
+        }
+        names = pa.DictionaryArray.from_arrays(arrays["material"], pa.array(self._names, type=pa.string()))
+        return pa.table({"name": names, **arrays})
+
+    def as_pandas(self) -> Any:
+        """Returns the table as pandas DataFrame.
+
+        Names of the materials are added as categorical column "name".
+
+        Raises:
+            ImportError: If pandas or NumPy is not installed.
+        """
+        try:
+            import pandas as pd
+        except ImportError as ex:
+            raise ImportError("pandas is required for DataFrames.") from ex
+
+        columns = self.as_numpy()
+        names = pd.Categorical(pd.Index(self._names, dtype=object).take(columns["material"]))
+        return pd.DataFrame({"name": names, **columns}, copy=False)
+
+
+    # ########
+    # Operators
+    # ########
+
+    def __len__(self) -> int:
+        return len(self._ZAI)
+
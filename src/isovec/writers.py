@@ -0,0 +1,221 @@
+"""Functions for writing material definitions of transport codes.
+
+Material cards for MCNP, Serpent and OpenMC are written for a collection of
+substances directly to a file handle, one material at a time. Isotopes are
+written in ascending order of their ZAI notation. Surrogate isotopes of natural
+elements (see `use_natural` of `get_isotopes()`) are written as natural
+elements, e.g. ZAID "26000" or OpenMC element "Fe".
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Literal, TextIO
+
+from .isotope import Isotope
+from .substance import Substance
+
+
+def mcnp_zaid(isotope: Isotope) -> int:
+    """Returns the ZAID of an isotope (without library identifier).
+
+    ZAID = Z*1000 + A, with the MCNP convention for metastable states
+    (A + 300 + 100*I) and A = 0 for natural elements.
+    """
+    if isotope.I:
+        return isotope.Z*1000 + isotope.A + 300 + 100*isotope.I
+    return isotope.Z*1000 + isotope.A
+
+def openmc_name(isotope: Isotope) -> str:
+    """Returns the OpenMC name of an isotope, e.g. "U235", "Am242_m1" or "Fe" for natural elements."""
+    if isotope.A == 0:
+        return isotope.element_symbol()
+    if isotope.I:
+        return f"{isotope.element_symbol()}{isotope.A}_m{isotope.I}"
+    return f"{isotope.element_symbol()}{isotope.A}"
+
+
+def write_mcnp(
+        substances: Iterable[Substance], file: TextIO, mode: Literal["atomic", "weight"] = "atomic",
+        use_natural: bool | Iterable = False, library: str = "", start: int = 1
+    ) -> int:
+    """Writes MCNP material cards ("m" cards) of substances.
+
+    Each card is preceded by a comment with name and density of the substance.
+    Weight fractions are written as negative values.
+
+    Args:
+        substances:
+            Substances to write.
+        file:
+            Text file handle.
+        mode:
+            Wether 'atomic' or 'weight' fractions are to be written.
+        use_natural:
+            Flag to use fraction of element, if it is natural.
+            Alternatively, a collection of elements can be supplied, that
+            shall be considered.
+        library:
+            Library identifier appended to each ZAID, e.g. ".80c".
+        start:
+            Number of the first material.
+
+    Returns:
+        Number of written materials.
+
+    Raises:
+        ValueError: If mode is not supported.
+    """
+
+    by_weight = _by_weight(mode)
+    natural_keys = Substance._natural_keys(use_natural)
+    sign = -1.0 if by_weight else 1.0
+
+    number = start
+    for substance in substances:
+        isotopes, fractions = _isotope_vector(substance, by_weight, natural_keys)
+        identifiers = [_mcnp_identifier(isotope, library) for isotope in isotopes]
+        entries = "\n     ".join(map("{} {:.8e}".format, identifiers, (sign*f_i for f_i in fractions)))
+        file.write(f"c {substance.name}, rho = {substance.rho:.6g} g/cm3\nm{number} {entries}\n")
+        number += 1
+    return number - start
+
+def write_serpent(
+        substances: Iterable[Substance], file: TextIO, mode: Literal["atomic", "weight"] = "atomic",
+        use_natural: bool | Iterable = False, library: str = ""
+    ) -> int:
+    """Writes Serpent material definitions ("mat" blocks) of substances.
+
+    The name of the substance is used as material name, with whitespaces
+    replaced by underscores. Density is written in g/cm3 (negative value),
+    weight fractions as negative values.
+
+    Args:
+        substances:
+            Substances to write.
+        file:
+            Text file handle.
+        mode:
+            Wether 'atomic' or 'weight' fractions are to be written.
+        use_natural:
+            Flag to use fraction of element, if it is natural.
+            Alternatively, a collection of elements can be supplied, that
+            shall be considered.
+        library:
+            Library identifier appended to each ZAID, e.g. ".09c".
+
+    Returns:
+        Number of written materials.
+
+    Raises:
+        ValueError: If mode is not supported, a substance has no density or
+        material names are not unique.
+    """
+
+    by_weight = _by_weight(mode)
+    natural_keys = Substance._natural_keys(use_natural)
+    sign = -1.0 if by_weight else 1.0
+
+    count = 0
+    seen: set[str] = set()
+    for substance in substances:
+        if not substance.rho:
+            raise ValueError(f"Serpent material of {substance.__class__.__name__} \"{substance.name}\" requires a density.")
+        isotopes, fractions = _isotope_vector(substance, by_weight, natural_keys)
+        identifiers = [_mcnp_identifier(isotope, library) for isotope in isotopes]
+        name = "_".join(substance.name.split())
+        if name in seen:
+            raise ValueError(f"Serpent material name \"{name}\" occurs more than once.")
+        seen.add(name)
+        file.write(
+            f"mat {name} {-substance.rho:.8g}\n"
+            + "".join(map("{} {:.8e}\n".format, identifiers, (sign*f_i for f_i in fractions)))
+        )
+        count += 1
+    return count
+
+def write_openmc(
+        substances: Iterable[Substance], file: TextIO, mode: Literal["atomic", "weight"] = "atomic",
+        use_natural: bool | Iterable = False, start: int = 1
+    ) -> int:
+    """Writes an OpenMC materials XML file of substances.
+
+    Isotopes are written as "nuclide" and surrogate isotopes of natural
+    elements as "element" entries, with "ao" or "wo" fractions.
+
+    Args:
+        substances:
+            Substances to write.
+        file:
+            Text file handle.
+        mode:
+            Wether 'atomic' or 'weight' fractions are to be written.
+        use_natural:
+            Flag to use fraction of element, if it is natural.
+            Alternatively, a collection of elements can be supplied, that
+            shall be considered.
+        start:
+            ID of the first material.
+
+    Returns:
+        Number of written materials.
+
+    Raises:
+        ValueError: If mode is not supported or a substance has no density.
+    """
+
+    by_weight = _by_weight(mode)
+    natural_keys = Substance._natural_keys(use_natural)
+    attribute = "wo" if by_weight else "ao"
+
+    file.write("<?xml version='1.0' encoding='utf-8'?>\n<materials>\n")
+    number = start
+    for substance in substances:
+        if not substance.rho:
+            raise ValueError(f"OpenMC material of {substance.__class__.__name__} \"{substance.name}\" requires a density.")
+        isotopes, fractions = _isotope_vector(substance, by_weight, natural_keys)
+        tags = [_openmc_tag(isotope, attribute) for isotope in isotopes]
+        file.write(
+            f"  <material id=\"{number}\" name={_quote_attribute(substance.name)}>\n"
+            f"    <density units=\"g/cm3\" value=\"{substance.rho:.8g}\" />\n"
+            + "".join(map("    {}\"{:.8e}\" />\n".format, tags, fractions))
+            + "  </material>\n"
+        )
+        number += 1
+    file.write("</materials>\n")
+    return number - start
+
+
+def _by_weight(mode: str) -> bool:
+    """Returns flag for weight fractions of given mode."""
+    if mode in {"atomic", "at", "mole", "mol"}:
+        return False
+    elif mode in {"weight", "wt"}:
+        return True
+    else:
+        raise ValueError(f"Mode \"{mode}\" not supported for writing materials.")
+
+def _isotope_vector(substance: Substance, by_weight: bool, natural_keys: bool | frozenset) -> tuple[list[Isotope], list[float]]:
+    """Returns isotopes (ascending ZAI notation) and their normalised fractions of a substance."""
+    raw_isotopes = substance._raw_isotopes(by_weight, natural_keys)
+    norm_tmp = sum(raw_isotopes.values())
+    isotopes = sorted(raw_isotopes, key=lambda isotope: isotope.ZAI)
+    return isotopes, [raw_isotopes[isotope]/norm_tmp for isotope in isotopes]
+
+def _quote_attribute(value: str) -> str:
+    """Returns value escaped and quoted as XML attribute."""
+    for char, entity in (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ("\"", "&quot;"),
+                         ("\n", "&#10;"), ("\r", "&#13;"), ("\t", "&#9;")):
+        value = value.replace(char, entity)
+    return f"\"{value}\""
+
+@lru_cache(maxsize=None)
+def _mcnp_identifier(isotope: Isotope, library: str) -> str:
+    """Returns ZAID with library identifier (cached)."""
+    return f"{mcnp_zaid(isotope)}{library}"
+
+@lru_cache(maxsize=None)
+def _openmc_tag(isotope: Isotope, attribute: str) -> str:
+    """Returns opening of the XML entry of an isotope up to its fraction (cached)."""
+    return f"<{'element' if isotope.A == 0 else 'nuclide'} name=\"{openmc_name(isotope)}\" {attribute}="
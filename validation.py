@@ -1,6 +1,4 @@
 
-import copy
-
 from tabulate import tabulate
 
 from src import isovec as iso
@@ -42,10 +40,11 @@ if __name__ == "__main__":
     ## isovec calculation
 
     # create copies of elements and overwrite atomic weights to match source
-    nickel = copy.deepcopy(iso.Ni_nat)
-    nickel._atomicWeight = 58.71
-    chromium = copy.deepcopy(iso.Cr_nat)
-    chromium._atomicWeight = 51.99
+    # (setting `_atomicWeight` of deep copies before did not change the molar
+    # mass, so library values were used: 77.99 at.% Ni and 22.01 at.% Cr
+    # instead of the expected 77.98 at.% and 22.02 at.%)
+    nickel = iso.Ni_nat.copy(M=58.71)
+    chromium = iso.Cr_nat.copy(M=51.99)
 
     Ni80Cr20 = iso.Mixture("Ni80Cr20", {
         nickel:   -80e-2,
@@ -450,3 +449,137 @@ if __name__ == "__main__":
         print()
         print("--- Mixture calculated by script: ---")
         air.print_tree_input(weight=True)
+
+
+
+    print()
+    print()
+    print(80*"X")
+    ###################
+    ### Chemical formulas
+    ###################
+    desc = r"""
+    test number of atoms and molar masses of molecules from chemical formulas
+    molar masses as in https://pubchem.ncbi.nlm.nih.gov/
+    """
+
+    print()
+    print(r"Chemical formulas Test Case")
+    print(desc)
+
+    tristearin = iso.molecule_from_formula("C57H110O6")
+    tetradecane = iso.molecule_from_formula("C14H30")
+    lsd = iso.molecule_from_formula("C20H25N3O")
+    atp = iso.molecule_from_formula("C10H16N5O13P3")
+
+    # extract results
+    res_table = [
+        compare("O in C57H110O6 [-]",       6, tristearin.get_composition_in_atoms()[iso.O_nat]),
+        compare("C57H110O6 [g mol^-1]",   891.5, round(tristearin.M, 1)),
+        compare("H in C14H30 [-]",         30, tetradecane.get_composition_in_atoms()[iso.H_nat]),
+        compare("C14H30 [g mol^-1]",      198.4, round(tetradecane.M, 1)),
+        compare("O in C20H25N3O [-]",       1, lsd.get_composition_in_atoms()[iso.O_nat]),
+        compare("C20H25N3O [g mol^-1]",   323.4, round(lsd.M, 1)),
+        compare("P in C10H16N5O13P3 [-]",   3, atp.get_composition_in_atoms()[iso.P_nat]),
+        compare("C10H16N5O13P3 [g mol^-1]", 507.2, round(atp.M, 1)),
+    ]
+    print(tabulate(res_table, headers=headers, **table_kwargs))
+    print()
+
+    if print_raw_output:
+        print(30*"#")
+        print()
+        print("--- Molecules calculated by script: ---")
+        for molecule in (tristearin, tetradecane, lsd, atp):
+            molecule.print_tree_input(weight=True)
+
+
+
+    print()
+    print()
+    print(80*"X")
+    ###################
+    ### Number densities of water
+    ###################
+    desc = r"""
+    test number densities of water with a density given as integer
+    Water with a density of 1 g/cm3 and a molar mass of 18.015 g/mol
+    """
+
+    print()
+    print(r"Number densities of water Test Case")
+    print(desc)
+
+    ## hand calculation
+
+    # molecules per barn-centimetre
+    N_H2O = 1 * 6.02214076E+23 / 18.015 * 1E-24
+
+
+    ## isovec calculation
+
+    water_1 = iso.molecule_from_formula("H2O")
+    zai, N = iso.number_densities(water_1, rho=1)
+    N_H = sum(N_i for zai_i, N_i in zip(zai, N) if zai_i//10000 == 1)
+    N_O = sum(N_i for zai_i, N_i in zip(zai, N) if zai_i//10000 == 8)
+
+    res_table = [
+        compare("H [barn^-1 cm^-1]", round(2*N_H2O, 5), round(N_H, 5)),
+        compare("O [barn^-1 cm^-1]", round(N_H2O, 5), round(N_O, 5)),
+    ]
+    print(tabulate(res_table, headers=headers, **table_kwargs))
+    print()
+
+    if print_raw_output:
+        print(30*"#")
+        print()
+        print("--- Number densities calculated by script: ---")
+        for zai_i, N_i in zip(zai, N):
+            print(f"{zai_i:>7d} {N_i:.6e}")
+
+
+
+    print()
+    print()
+    print(80*"X")
+    ###################
+    ### Substitution of lithium in Li17Pb83
+    ###################
+    desc = r"""
+    test that substituted materials keep their given density and get the molar
+    mass of the new composition
+    Eutectic Li17Pb83 (9.5 g/cm3) with natural lithium replaced by lithium
+    enriched to 90 at.% Li-6
+    """
+
+    print()
+    print(r"Substitution of lithium in Li17Pb83 Test Case")
+    print(desc)
+
+    ## hand calculation
+
+    M_Li_enr = 0.9*iso.Li_6.M + 0.1*iso.Li_7.M
+    M_LiPb_enr = 0.17*M_Li_enr + 0.83*iso.Pb_nat.M
+
+
+    ## isovec calculation
+
+    Li_enr = iso.Element("enriched lithium", {iso.Li_6: 0.9, iso.Li_7: 0.1}, mode="atomic")
+    LiPb = iso.Mixture("Li17Pb83", {iso.Li_nat: 0.17, iso.Pb_nat: 0.83}, mode="atomic", rho=9.5)
+
+    library = iso.MaterialLibrary()
+    library.register(LiPb)
+    LiPb_enr, = library.substitute({iso.Li_nat: Li_enr})
+
+    res_table = [
+        compare("rho [g cm^-3]", 9.5, LiPb_enr.rho),
+        compare("M [g mol^-1]", round(M_LiPb_enr, 4), round(LiPb_enr.M, 4)),
+    ]
+    print(tabulate(res_table, headers=headers, **table_kwargs))
+    print()
+
+    if print_raw_output:
+        print(30*"#")
+        print()
+        print("--- Mixture calculated by script: ---")
+        LiPb_enr.print_tree_input(weight=True)